@@ -0,0 +1,72 @@
+"""One file of pre-decoded RGBA images, memory-mapped at startup.
+
+Layout (little endian):
+
+    b"CGBUNDLE"  magic
+    uint32       format version
+    uint32       length of the JSON index
+    JSON index   {name: [offset, width, height], ...}
+    pixels       from the next 16-byte boundary: width * height * 4 bytes of
+                 RGBA per image at ``offset`` into the pixel data, 16-byte aligned
+
+``write_bundle`` is the packaging step (assets.build_bundle chooses the
+images).  ``AssetBundle`` maps the file read-only and hands out surfaces
+made with ``pygame.image.frombuffer`` straight over the mapped pages, so
+nothing is decoded or scaled at startup.  Those surfaces share the mapping:
+blit from them or copy them (``convert_alpha``), never draw onto them.
+"""
+import json
+import mmap
+import struct
+
+import pygame
+
+MAGIC = b"CGBUNDLE"
+VERSION = 1
+HEADER = struct.Struct("<8sII")
+ALIGN = 16
+
+
+def _aligned(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def write_bundle(path, surfaces):
+    """Write {name: Surface} as a bundle file"""
+    pixels = {name: pygame.image.tobytes(surface, "RGBA") for name, surface in surfaces.items()}
+    index = {}
+    offset = 0
+    for name in sorted(pixels):
+        index[name] = [offset, *surfaces[name].get_size()]
+        offset = _aligned(offset + len(pixels[name]))
+    index_bytes = json.dumps(index, sort_keys=True).encode("utf-8")
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(index_bytes)))
+        file.write(index_bytes)
+        start = _aligned(file.tell())
+        for name in sorted(pixels):
+            file.write(b"\0" * (start + index[name][0] - file.tell()))
+            file.write(pixels[name])
+    return path
+
+
+class AssetBundle:
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_length = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} asset bundle")
+        self.index = json.loads(self._map[HEADER.size:HEADER.size + index_length])
+        self._start = _aligned(HEADER.size + index_length)
+        self._view = memoryview(self._map)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def surface(self, name):
+        """A 32-bit RGBA surface over the mapped pixels of ``name``"""
+        offset, width, height = self.index[name]
+        offset += self._start
+        return pygame.image.frombuffer(self._view[offset:offset + width * height * 4], (width, height), "RGBA")
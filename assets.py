@@ -0,0 +1,230 @@
+"""Card image loading from the bundled tilesheets.
+
+Instead of decoding one PNG per card, a whole packed tilesheet is decoded
+once, the 13x4 block of playing cards is scaled in a single pass and every
+card is handed out as a subsurface of that one scaled sheet.
+
+Filtered looks (see filters.py) are made by running the filter chain over
+a copy of the whole scaled sheet, so all 52 cards get the look at once.
+
+``card_images`` is the process-wide cache every Deck draws from, and
+``scale_cached`` hands out scaled copies of any surface so draw code never
+rescales the same image twice.
+
+Packaged builds skip the PNGs: ``python assets.py`` (run by game.spec)
+decodes and scales the sheets and icons the game shows into one raw RGBA
+bundle (asset_bundle.py), which is memory-mapped at startup.  Without the
+bundle, as when running from source, images are decoded from the PNGs.
+"""
+import os
+import sys
+from collections import OrderedDict
+
+import pygame
+
+from asset_bundle import AssetBundle, write_bundle
+from cards import CARD_RANKS, CARD_SUITS, DECK_SIZE, RANKS, SUITS
+from filters import apply_to_sheet
+from paths import get_asset_path
+
+CARD_SIZE = (100, 145)
+
+
+# Packed Kenney tilesheets and their tile size. Each suit is a row in
+# Hearts, Diamonds, Clubs, Spades order, starting with the Ace.
+CARD_SHEETS = {
+    "small": ("card_images/Tilesheet/cardsSmall_tilemap_packed.png", 16),
+    "medium": ("card_images/Tilesheet/cardsMedium_tilemap_packed.png", 32),
+    "large": ("card_images/Tilesheet/cardsLarge_tilemap_packed.png", 64),
+}
+
+
+def atlas_position(card):
+    """(column, row) of a card's tile in the sheet"""
+    return (CARD_RANKS[card] + 1) % len(RANKS), CARD_SUITS[card]
+
+
+# What the bundle holds: card sheets at the hand size and UI.DECK_CARD_SIZE, icons at the stats size
+BUNDLE_FILE = "assets.bundle"
+BUNDLED_SHEETS = (("medium", CARD_SIZE), ("medium", (50, 70)))
+ICON_SIZE = (20, 20)
+ICONS = ("board_game_icons/PNG/Default (64px)/skull.png", "board_game_icons/PNG/Default (64px)/shield.png")
+
+
+def bundle_name(path, size):
+    return f"{path}@{size[0]}x{size[1]}"
+
+
+def decode_card_sheet(size=CARD_SIZE, sheet="medium"):
+    """The 13x4 block of playing cards decoded from a tilesheet PNG and scaled so each card is ``size``"""
+    path, tile = CARD_SHEETS[sheet]
+    image = pygame.image.load(get_asset_path(path))
+    card_block = image.subsurface((0, 0, len(RANKS) * tile, len(SUITS) * tile))
+
+    width, height = size
+    return pygame.transform.scale(card_block, (len(RANKS) * width, len(SUITS) * height))
+
+
+def decode_icon(path, size=ICON_SIZE):
+    return pygame.transform.scale(pygame.image.load(get_asset_path(path)), size)
+
+
+def build_bundle(path=BUNDLE_FILE):
+    """Packaging step: write every bundled image, decoded and scaled, to ``path``"""
+    surfaces = {bundle_name(CARD_SHEETS[sheet][0], size): decode_card_sheet(size, sheet)
+                for sheet, size in BUNDLED_SHEETS}
+    for icon in ICONS:
+        surfaces[bundle_name(icon, ICON_SIZE)] = decode_icon(icon)
+    return write_bundle(path, surfaces)
+
+
+def open_bundle():
+    """The packaged AssetBundle, or None to decode PNGs"""
+    path = get_asset_path(BUNDLE_FILE)
+    if not os.path.exists(path):
+        return None
+    return AssetBundle(path)
+
+
+bundle = open_bundle()
+
+
+def load_card_sheet(size=CARD_SIZE, sheet="medium"):
+    """The 13x4 block of playing cards from a tilesheet, scaled so each card is ``size``"""
+    name = bundle_name(CARD_SHEETS[sheet][0], size)
+    if bundle is not None and name in bundle:
+        # A copy in the display format: the filters draw onto copies of the sheet
+        return bundle.surface(name).convert_alpha()
+    return decode_card_sheet(size, sheet).convert_alpha()
+
+
+def load_icon(path, size=ICON_SIZE):
+    """A UI icon at ``size``; bundled icons are blitted straight from the mapped file"""
+    name = bundle_name(path, size)
+    if bundle is not None and name in bundle:
+        return bundle.surface(name)
+    return decode_icon(path, size)
+
+
+def cut_card_sheet(scaled, size=CARD_SIZE):
+    """Return {card: subsurface} of a sheet from load_card_sheet"""
+    width, height = size
+    images = {}
+    for card in range(DECK_SIZE):
+        col, row = atlas_position(card)
+        images[card] = scaled.subsurface((col * width, row * height, width, height))
+    return images
+
+
+def load_card_atlas(size=CARD_SIZE, sheet="medium"):
+    """Return {card: Surface of ``size``} cut from one decoded tilesheet."""
+    return cut_card_sheet(load_card_sheet(size, sheet), size)
+
+
+class CardImageCache:
+    """Shared card surfaces keyed by (card, size, filter chain).
+
+    The unit of caching is a sheet: the first request for any card of a size
+    and chain fills in all 52 cards of it as subsurfaces of one scaled sheet,
+    plain ones cut from the tilesheet, filtered ones from a filtered copy of
+    the plain sheet.  Whole sheets are evicted least recently used first once
+    their pixels exceed ``max_bytes``.  ``hits`` and ``misses`` count callers'
+    requests.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, sheet="medium"):
+        self.max_bytes = max_bytes
+        self.sheet = sheet
+        self.hits = 0
+        self.misses = 0
+        self._sheets = OrderedDict()  # (size, chain) -> (sheet, {card: subsurface})
+        self._bytes = 0
+
+    def get(self, card, size=CARD_SIZE, chain=None):
+        key = (size, chain)
+        if key in self._sheets:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return self._sheet(size, chain)[1][card]
+
+    def _sheet(self, size, chain):
+        key = (size, chain)
+        entry = self._sheets.get(key)
+        if entry is not None:
+            self._sheets.move_to_end(key)
+            return entry
+
+        if chain is None:
+            sheet = load_card_sheet(size, self.sheet)
+        else:
+            sheet = self._sheet(size, None)[0].copy()
+            apply_to_sheet(sheet, size, chain)
+        entry = (sheet, cut_card_sheet(sheet, size))
+        self._sheets[key] = entry
+        self._bytes += _surface_bytes(sheet)
+        while self._bytes > self.max_bytes and len(self._sheets) > 1:
+            _, (evicted, _) = self._sheets.popitem(last=False)
+            self._bytes -= _surface_bytes(evicted)
+        return entry
+
+    def clear(self):
+        self._sheets.clear()
+        self._bytes = 0
+
+    def stats(self):
+        return {"sheets": len(self._sheets), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+class ScaledSurfaceCache:
+    """Scaled copies of surfaces keyed by (source, size, smooth).
+
+    Each entry keeps its source surface alive so the source's id() can't be
+    reused by another surface while the entry exists.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, surface, size, smooth=False):
+        key = (id(surface), size, smooth)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+        self.misses += 1
+        if smooth:
+            scaled = pygame.transform.smoothscale(surface, size)
+        else:
+            scaled = pygame.transform.scale(surface, size)
+        self._entries[key] = (surface, scaled)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return scaled
+
+    def clear(self):
+        self._entries.clear()
+
+
+def _surface_bytes(surface):
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+
+card_images = CardImageCache()
+scaled_surfaces = ScaledSurfaceCache()
+
+
+def scale_cached(surface, size, smooth=False):
+    """``surface`` scaled to ``size``, computed once per distinct source/size"""
+    return scaled_surfaces.get(surface, size, smooth)
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else BUNDLE_FILE
+    print(build_bundle(target), f"{os.path.getsize(target) / 1e6:.1f} MB")
@@ -0,0 +1,202 @@
+"""NumPy batch simulator for the combat rules in engine.py.
+
+Keeps N independent matches of one deck pair as struct-of-arrays columns
+(``life[side, match]`` and so on) and advances every running match by one
+action per vectorized step.  Both sides follow ``engine.random_policy``:
+play a random card from the hand, draw when the hand is empty.
+
+Per-play work is lookups into the compiled card rules (rules.py) and one
+masked array update per effect opcode in play.
+"""
+import time
+
+import numpy as np
+
+import cards
+import engine
+import rules
+
+PLAYER, ENEMY = 0, 1
+EMPTY = -1
+
+# The compiled card rules engine.py plays, as arrays
+CARD_COSTS = np.array(engine.CARD_RULES.costs, dtype=np.int32)
+CARD_OPS = engine.CARD_RULES.ops
+CARD_AMOUNTS = engine.CARD_RULES.amounts
+# Opcodes present in each effect slot, so absent effects cost nothing per step
+SLOT_OPCODES = [sorted(set(CARD_OPS[:, slot].tolist()) - {rules.NO_EFFECT}) for slot in range(CARD_OPS.shape[1])]
+
+
+class BatchMatches:
+    """N matches between the same two decks, advanced in lock-step."""
+
+    def __init__(self, player_cards, enemy_cards, n, rng=None, max_turns=500):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.n = n
+        self.max_turns = max_turns
+
+        decks = [np.array(player_cards, dtype=np.int16), np.array(enemy_cards, dtype=np.int16)]
+        self.deck_len = np.array([len(d) for d in decks], dtype=np.int32)
+        self.decks = np.full((2, n, max(1, self.deck_len.max())), EMPTY, dtype=np.int16)
+        for side, codes in enumerate(decks):
+            if len(codes):
+                self.decks[side, :, :len(codes)] = self.rng.permuted(
+                    np.broadcast_to(codes, (n, len(codes))), axis=1)
+        self.cursor = np.zeros((2, n), dtype=np.int32)
+
+        self.hand = np.full((2, n, engine.HAND_SIZE), EMPTY, dtype=np.int16)
+        self.hand_len = np.zeros((2, n), dtype=np.int32)
+
+        self.life = np.full((2, n), engine.STARTING_LIFE, dtype=np.int32)
+        self.poison = np.zeros((2, n), dtype=np.int32)
+        self.shield = np.zeros((2, n), dtype=np.int32)
+        self.damage = np.zeros((2, n), dtype=np.int32)
+        self.mana = np.empty((2, n), dtype=np.int32)
+        self.mana[PLAYER] = engine.PLAYER_START_MANA
+        self.mana[ENEMY] = engine.ENEMY_START_MANA
+
+        self.active = np.zeros(n, dtype=np.int32)
+        self.turns = np.zeros(n, dtype=np.int32)
+        self.done = np.zeros(n, dtype=bool)
+
+        everyone = np.arange(n)
+        for side in (PLAYER, ENEMY):
+            for _ in range(engine.STARTING_HAND):
+                self._draw(np.full(n, side), everyone)
+
+    # -------------------------------
+    # Vectorized transitions
+    # -------------------------------
+    def _draw(self, s, idx):
+        """Draw one card for side ``s[i]`` of match ``idx[i]``."""
+        has = self.cursor[s, idx] < self.deck_len[s]
+        s, idx = s[has], idx[has]
+        drawn = self.decks[s, idx, self.cursor[s, idx]]
+        self.cursor[s, idx] += 1
+
+        # A full hand drops its oldest card, like draw_into_hand
+        full = self.hand_len[s, idx] == engine.HAND_SIZE
+        fs, fidx = s[full], idx[full]
+        self.hand[fs, fidx, :-1] = self.hand[fs, fidx, 1:]
+        self.hand_len[fs, fidx] -= 1
+
+        self.hand[s, idx, self.hand_len[s, idx]] = drawn
+        self.hand_len[s, idx] += 1
+
+    def _play(self, s, idx, k):
+        """Side ``s[i]`` of match ``idx[i]`` plays the card in hand slot ``k[i]``."""
+        o = 1 - s
+        hand = self.hand[s, idx]
+        played = hand[np.arange(len(idx)), k]
+        slots = np.arange(engine.HAND_SIZE - 1)
+        hand[:, :-1] = np.where(slots >= k[:, None], hand[:, 1:], hand[:, :-1])
+        hand[:, -1] = EMPTY
+        self.hand[s, idx] = hand
+        self.hand_len[s, idx] -= 1
+
+        self.mana[s, idx] -= CARD_COSTS[played]
+        ops, amounts = CARD_OPS[played], CARD_AMOUNTS[played]
+        for slot, codes in enumerate(SLOT_OPCODES):
+            for code in codes:
+                hit = ops[:, slot] == code
+                if hit.any():
+                    self._effect(code, hit, s, o, idx, amounts[:, slot])
+
+    def _effect(self, code, hit, s, o, idx, amount):
+        """Apply opcode ``code`` (rules.py) where ``hit``, with per-match ``amount``."""
+        if code == rules.DAMAGE:
+            self.damage[s, idx] = np.where(hit, amount, self.damage[s, idx])
+        elif code == rules.SHIELD:
+            self.shield[s, idx] += np.where(hit, amount, 0)
+        elif code == rules.STRIP_SHIELD:
+            enemy_shield = self.shield[o, idx]
+            self.shield[o, idx] = np.where(hit, np.maximum(0, enemy_shield - amount), enemy_shield)
+        elif code == rules.SHIELD_DAMAGE:
+            self.damage[s, idx] = np.where(hit, self.shield[s, idx], self.damage[s, idx])
+        elif code == rules.POISON:
+            self.poison[o, idx] += np.where(hit, amount, 0)
+        elif code == rules.CURE:
+            own_poison = self.poison[s, idx]
+            self.poison[s, idx] = np.where(hit, np.maximum(0, own_poison - amount), own_poison)
+        elif code == rules.HEAL:
+            self.life[s, idx] += np.where(hit, amount, 0)
+
+    def _end_turn(self, idx):
+        s = self.active[idx]
+        o = 1 - s
+
+        draws = np.where(s == PLAYER, engine.ENEMY_TURN_DRAW, engine.PLAYER_TURN_DRAW)
+        for i in range(max(engine.ENEMY_TURN_DRAW, engine.PLAYER_TURN_DRAW)):
+            more = draws > i
+            self._draw(o[more], idx[more])
+
+        self.life[o, idx] -= self.poison[o, idx]
+        self.life[o, idx] -= np.maximum(0, self.damage[s, idx] - self.shield[o, idx])
+        self.shield[o, idx] = np.maximum(0, self.shield[o, idx] - 2)
+        self.poison[s, idx] = np.maximum(0, self.poison[s, idx] - 2)
+        own_mana = self.mana[s, idx]
+        self.mana[o, idx] = np.where(own_mana < 0, -own_mana, self.mana[o, idx])
+        self.damage[s, idx] = 0
+
+        self.active[idx] = o
+        self.turns[idx] += 1
+
+    def step(self):
+        """Advance every running match by one action; returns how many ran."""
+        idx = np.flatnonzero(~self.done)
+        if not len(idx):
+            return 0
+        s = self.active[idx]
+        hand_len = self.hand_len[s, idx]
+
+        plays = hand_len > 0
+        k = (self.rng.random(plays.sum()) * hand_len[plays]).astype(np.int32)
+        self._play(s[plays], idx[plays], k)
+
+        draws = ~plays
+        ds, didx = s[draws], idx[draws]
+        self.mana[ds, didx] -= 1
+        self._draw(ds, didx)
+
+        over = self.mana[s, idx] < 0
+        self._end_turn(idx[over])
+
+        finished = (self.life[PLAYER, idx] <= 0) | (self.life[ENEMY, idx] <= 0)
+        self.done[idx] = finished | (self.turns[idx] >= self.max_turns)
+        return len(idx)
+
+    def run(self):
+        while self.step():
+            pass
+        return self
+
+    @property
+    def winners(self):
+        """PLAYER, ENEMY or -1 (unfinished) per match, as in MatchState.winner."""
+        finished = (self.life[PLAYER] <= 0) | (self.life[ENEMY] <= 0)
+        player_won = self.life[ENEMY] < self.life[PLAYER]
+        return np.where(finished, np.where(player_won, PLAYER, ENEMY), -1)
+
+
+def simulate(player_cards, enemy_cards, n, seed=None, max_turns=500):
+    """Play ``n`` matches and return a summary dict of counts and turn lengths.
+
+    ``seed`` is an int or a SeedSequence, e.g. from seeding.seed_sequence.
+    """
+    batch = BatchMatches(player_cards, enemy_cards, n, np.random.default_rng(seed), max_turns).run()
+    winners = batch.winners
+    return {
+        "games": n,
+        "player_wins": int((winners == PLAYER).sum()),
+        "enemy_wins": int((winners == ENEMY).sum()),
+        "unfinished": int((winners == -1).sum()),
+        "turns": int(batch.turns.sum()),
+    }
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    result = simulate(cards.new_deck(), cards.new_deck(), 100_000)
+    elapsed = time.perf_counter() - start
+    print(result)
+    print(f"{result['games'] / elapsed:,.0f} matches/s")
@@ -0,0 +1,246 @@
+"""Headless timings of the UI draw paths and a few hot helpers.
+
+Usage:
+    python benchmarks.py                              # print percentiles
+    python benchmarks.py --save bench_baseline.json   # store a baseline
+    python benchmarks.py --compare bench_baseline.json
+
+Runs on SDL's dummy video driver, so no window opens.  Each benchmark is
+timed in ``--samples`` samples of ``number`` calls; the table shows per-call
+percentiles in microseconds.  With ``--compare`` every benchmark whose
+median is more than ``--tolerance`` slower than the baseline is reported and
+the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import assets
+import cards
+import engine
+import search_ai
+from character import Character
+from drawing import UI, card_name_to_filename
+from seeding import MatchStreams
+
+WIDTH, HEIGHT = 1280, 720
+
+BENCHMARKS = {}
+
+
+def benchmark(name, number=100):
+    """Register ``make(screen)`` returning (fn, setup); setup runs untimed before each sample."""
+    def register(make):
+        BENCHMARKS[name] = (make, number)
+        return make
+    return register
+
+
+def dealt_players():
+    player, enemy = Character(), Character()
+    for character in (player, enemy):
+        while len(character.drawn_cards) < character.drawn_cards.capacity:
+            character.drawn_cards.append(character.deck.draw()[0])
+    player.selected_card = player.drawn_cards[2]
+    player.selected_card_position = 2
+    return player, enemy
+
+
+# -------------------------------
+# UI draw paths
+# -------------------------------
+@benchmark("ui.draw_main")
+def bench_draw_main(screen):
+    ui = UI(screen)
+    return ui.draw_main, None
+
+
+@benchmark("ui.draw_board")
+def bench_draw_board(screen):
+    ui = UI(screen)
+    return ui.draw_board, None
+
+
+@benchmark("ui.draw_game")
+def bench_draw_game(screen):
+    ui = UI(screen)
+    player, enemy = dealt_players()
+    player.mana, enemy.mana = 8, 3
+    return lambda: ui.draw_game(player, enemy), None
+
+
+@benchmark("ui.draw_deck_builder")
+def bench_draw_deck_builder(screen):
+    ui = UI(screen)
+    player = Character()
+    ui.deckbuilder_index = 5
+    return lambda: ui.draw_deck_builder(player), None
+
+
+@benchmark("ui.card_modifier")
+def bench_card_modifier(screen):
+    ui = UI(screen)
+    player = Character()
+    player.deckbuilder_selected_card = player.deck.cards[0]
+    return lambda: ui.card_modifier(player), None
+
+
+@benchmark("ui.draw_card_slots")
+def bench_draw_card_slots(screen):
+    ui = UI(screen)
+    player, enemy = dealt_players()
+    played = player.deck.cards[0]
+    preview = enemy.deck.cards[0]
+    return lambda: ui.draw_card_slots(player, enemy, played, player.deck, preview), None
+
+
+# -------------------------------
+# Helpers
+# -------------------------------
+@benchmark("assets.load_card_atlas", number=1)
+def bench_load_card_atlas(screen):
+    # Replaces the old Deck.load_card_images (one decode and scale of the tilesheet)
+    return assets.load_card_atlas, None
+
+
+@benchmark("drawing.card_name_to_filename", number=1000)
+def bench_card_name_to_filename(screen):
+    return lambda: card_name_to_filename("Queen of Hearts"), None
+
+
+@benchmark("character.calc_damage", number=1000)
+def bench_calc_damage(screen):
+    player, enemy = Character(), Character()
+    card = cards.parse_card("7 of Clubs")
+    return lambda: player.calc_damage(card, enemy), None
+
+
+@benchmark("search_ai.choose", number=1)
+def bench_search_choose(screen):
+    # Fixed depth instead of a time budget, so the work per call doesn't change
+    state = engine.new_match(cards.new_deck(), cards.new_deck(), MatchStreams(0))
+    engine.apply_play(state, 0)
+    engine.apply_draw(state)
+    engine.end_turn(state)
+    rng = random.Random(0)
+    ai = search_ai.SearchAI(budget_ms=10 ** 6, max_depth=3)
+    return lambda: ai.choose(state, rng), ai.table.clear
+
+
+@benchmark("deck.draw", number=50)
+def bench_deck_draw(screen):
+    deck = Character().deck
+    full = deck.cards.tolist()
+    return deck.draw, lambda: deck.cards.reset(full)
+
+
+# -------------------------------
+# Running and reporting
+# -------------------------------
+def percentile(ordered, q):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_benchmark(screen, name, samples, warmup=3):
+    make, number = BENCHMARKS[name]
+    fn, setup = make(screen)
+    for _ in range(warmup):
+        if setup:
+            setup()
+        for _ in range(number):
+            fn()
+
+    times = []
+    for _ in range(samples):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number * 1e6)
+
+    times.sort()
+    return {
+        "p50": percentile(times, 50),
+        "p90": percentile(times, 90),
+        "p99": percentile(times, 99),
+        "mean": sum(times) / len(times),
+        "samples": samples,
+        "number": number,
+    }
+
+
+def run_all(names, samples):
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    return {name: run_benchmark(screen, name, samples) for name in names}
+
+
+def compare(results, baseline, tolerance):
+    """Names of the benchmarks whose median regressed past ``tolerance``"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is not None and result["p50"] > base["p50"] * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def report(results, baseline=None, file=sys.stdout):
+    print(f"{'benchmark':<32} {'p50 us':>10} {'p90 us':>10} {'p99 us':>10} {'vs base':>8}", file=file)
+    for name, result in results.items():
+        change = ""
+        if baseline and name in baseline:
+            change = f"{100 * (result['p50'] / baseline[name]['p50'] - 1):+.0f}%"
+        print(f"{name:<32} {result['p50']:>10.1f} {result['p90']:>10.1f} {result['p99']:>10.1f} {change:>8}",
+              file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--save", help="write the results as a baseline JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to check against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed median slowdown, 0.25 = 25%%")
+    args = parser.parse_args(argv)
+
+    names = args.names or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    results = run_all(names, args.samples)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)["results"]
+    report(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "pygame": pygame.version.ver, "results": results}, file, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        for name in regressions:
+            print(f"REGRESSION {name}: p50 {results[name]['p50']:.1f} us vs {baseline[name]['p50']:.1f} us")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
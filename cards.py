@@ -0,0 +1,56 @@
+"""Compact card encoding.
+
+A card is a plain int 0-51: ``suit * 13 + rank``, in the same order as a
+fresh deck.  Everything about a card (value, suit, display name, image key)
+is a lookup into the tables below, built once at import.  "Rank of Suit"
+strings only appear at the UI/log boundary and in deck files.
+"""
+SUITS = ["Hearts", "Diamonds", "Clubs", "Spades"]
+RANKS = ["2", "3", "4", "5", "6", "7", "8", "9", "10",
+         "Jack", "Queen", "King", "Ace"]
+HEARTS, DIAMONDS, CLUBS, SPADES = range(len(SUITS))
+DECK_SIZE = len(SUITS) * len(RANKS)
+
+_RANK_FILE_NAMES = ["02", "03", "04", "05", "06", "07", "08", "09", "10", "J", "Q", "K", "A"]
+
+CARD_SUITS = [card // len(RANKS) for card in range(DECK_SIZE)]
+CARD_RANKS = [card % len(RANKS) for card in range(DECK_SIZE)]
+CARD_VALUES = [rank + 2 for rank in CARD_RANKS]  # 2..10, Jack 11 ... Ace 14
+CARD_NAMES = [f"{RANKS[r]} of {SUITS[s]}" for s, r in zip(CARD_SUITS, CARD_RANKS)]
+IMAGE_KEYS = [f"card_{SUITS[s].lower()}_{_RANK_FILE_NAMES[r]}" for s, r in zip(CARD_SUITS, CARD_RANKS)]
+
+_BY_NAME = {name: card for card, name in enumerate(CARD_NAMES)}
+_BY_IMAGE_KEY = {key: card for card, key in enumerate(IMAGE_KEYS)}
+
+
+def new_deck():
+    return list(range(DECK_SIZE))
+
+
+def parse_card(name):
+    """'Ace of Spades' -> card"""
+    try:
+        return _BY_NAME[name]
+    except KeyError:
+        raise ValueError(f"Unknown card '{name}'") from None
+
+
+def card_name(card):
+    """card -> 'Ace of Spades'"""
+    return CARD_NAMES[card]
+
+
+def card_from_image_key(key):
+    """'card_spades_A' -> card"""
+    return _BY_IMAGE_KEY[key]
+
+
+def read_deck_file(filename):
+    """Read a deck file: one 'Rank of Suit' card per line."""
+    with open(filename, 'r', encoding='utf-8') as file:
+        return [parse_card(line.strip()) for line in file if line.strip()]
+
+
+def write_deck_file(filename, cards):
+    with open(filename, 'w', encoding='utf-8') as file:
+        file.writelines(CARD_NAMES[card] + "\n" for card in cards)
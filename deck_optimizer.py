@@ -0,0 +1,185 @@
+"""Genetic search for strong decks against a gauntlet of deck files.
+
+Usage:
+    python deck_optimizer.py decks/ --generations 30 --population 40 --out best_decks/
+
+Candidates are multisets of ``--deck-size`` cards drawn from the cards of
+``Deck.create_new_deck`` (a fresh 52-card deck), with at most
+``--max-copies`` of each.  A candidate's fitness is its win rate from
+``--seat`` (the enemy by default) over ``--games`` batch_sim matches
+against every gauntlet deck (``*.txt`` in the ``Deck.load_deck`` format; a
+fresh deck when no directory is given).  Every candidate plays the same
+seeded matches, so scores are comparable and repeatable.
+
+Fitness runs on a process pool.  Scores are cached by the candidate's
+sorted card multiset, so elites, repeated children and decks that differ
+only in card order are never simulated twice.  The best ``--keep`` decks
+are written to ``--out`` as deck files ``load_deck`` reads.
+"""
+import argparse
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import batch_sim
+import cards
+import seeding
+from tournament import load_decks
+
+
+def canonical(deck):
+    """Cache key of a deck: its cards as a sorted multiset"""
+    return tuple(sorted(deck))
+
+
+def evaluate(deck, gauntlet, games, seed, seat, max_turns):
+    """Mean win rate of ``deck`` from ``seat`` against each gauntlet deck"""
+    wins = 0
+    for n, opponent in enumerate(gauntlet):
+        # The same stream for every candidate facing opponent n
+        stream = seeding.seed_sequence(seed, seeding.OPTIMIZER, n)
+        if seat == "enemy":
+            result = batch_sim.simulate(opponent, deck, games, stream, max_turns)
+            wins += result["enemy_wins"]
+        else:
+            result = batch_sim.simulate(deck, opponent, games, stream, max_turns)
+            wins += result["player_wins"]
+    return wins / (games * len(gauntlet))
+
+
+# -------------------------------
+# Genetic operators
+# -------------------------------
+def random_deck(rng, alphabet, size, max_copies):
+    pool = [card for card in alphabet for _ in range(max_copies)]
+    return canonical(rng.sample(pool, size))
+
+
+def repair(counts, rng, alphabet, size, max_copies):
+    """Trim or fill a card -> count mapping to ``size`` cards within the copy limit"""
+    deck = [card for card, count in counts.items() for _ in range(min(count, max_copies))]
+    rng.shuffle(deck)
+    deck = deck[:size]
+    counts = Counter(deck)
+    while len(deck) < size:
+        card = rng.choice(alphabet)
+        if counts[card] < max_copies:
+            counts[card] += 1
+            deck.append(card)
+    return canonical(deck)
+
+
+def crossover(a, b, rng, alphabet, size, max_copies):
+    """Each card's count comes from one parent or the other"""
+    counts_a, counts_b = Counter(a), Counter(b)
+    counts = {card: rng.choice((counts_a[card], counts_b[card])) for card in set(a) | set(b)}
+    return repair(counts, rng, alphabet, size, max_copies)
+
+
+def mutate(deck, rng, alphabet, max_copies, swaps):
+    """Swap ``swaps`` cards for others, like Deck.swap_card in the deck builder"""
+    deck = list(deck)
+    counts = Counter(deck)
+    for _ in range(swaps):
+        i = rng.randrange(len(deck))
+        card = rng.choice(alphabet)
+        if card != deck[i] and counts[card] < max_copies:
+            counts[deck[i]] -= 1
+            counts[card] += 1
+            deck[i] = card
+    return canonical(deck)
+
+
+def select(scored, rng, k=3):
+    """Tournament selection over (fitness, deck) pairs"""
+    return max(rng.sample(scored, k))[1]
+
+
+# -------------------------------
+# Search
+# -------------------------------
+class Optimizer:
+    def __init__(self, gauntlet, args, pool):
+        self.gauntlet = gauntlet
+        self.args = args
+        self.pool = pool
+        self.rng = seeding.python_stream(args.seed, seeding.OPTIMIZER)
+        self.alphabet = cards.new_deck()  # what Deck.create_new_deck returns
+        self.cache = {}  # canonical deck -> fitness
+        self.simulated = 0
+
+    def fitness(self, decks):
+        """Scores of ``decks``, simulating only multisets not seen before"""
+        missing = list({deck for deck in decks if deck not in self.cache})
+        args = self.args
+        n = len(missing)
+        scores = self.pool.map(evaluate, missing, [self.gauntlet] * n, [args.games] * n,
+                               [args.seed] * n, [args.seat] * n, [args.max_turns] * n)
+        for deck, score in zip(missing, scores):
+            self.cache[deck] = score
+        self.simulated += n
+        return [(self.cache[deck], deck) for deck in decks]
+
+    def run(self):
+        args, rng = self.args, self.rng
+        population = [random_deck(rng, self.alphabet, args.deck_size, args.max_copies)
+                      for _ in range(args.population)]
+        for generation in range(args.generations):
+            start = time.perf_counter()
+            scored = sorted(self.fitness(population), reverse=True)
+            best, mean = scored[0][0], sum(score for score, _ in scored) / len(scored)
+            print(f"generation {generation:>3}: best {100 * best:6.2f}% mean {100 * mean:6.2f}% "
+                  f"({self.simulated} decks simulated, {len(self.cache)} cached) "
+                  f"{time.perf_counter() - start:.1f}s", flush=True)
+
+            children = [deck for _, deck in scored[:args.elite]]
+            while len(children) < args.population:
+                child = crossover(select(scored, rng), select(scored, rng), rng,
+                                  self.alphabet, args.deck_size, args.max_copies)
+                children.append(mutate(child, rng, self.alphabet, args.max_copies, args.mutations))
+            population = children
+        return sorted(((score, deck) for deck, score in self.cache.items()), reverse=True)
+
+
+def write_decks(ranked, out_dir, keep):
+    os.makedirs(out_dir, exist_ok=True)
+    for rank, (score, deck) in enumerate(ranked[:keep], 1):
+        path = os.path.join(out_dir, f"optimized_{rank:02d}.txt")
+        cards.write_deck_file(path, deck)
+        print(f"{path}: {100 * score:.2f}% wins")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("gauntlet_dir", nargs="?", help="directory of opponent deck files (*.txt)")
+    parser.add_argument("--seat", choices=("enemy", "player"), default="enemy", help="side the optimized deck plays")
+    parser.add_argument("--generations", type=int, default=30)
+    parser.add_argument("--population", type=int, default=40)
+    parser.add_argument("--elite", type=int, default=4, help="best decks carried over unchanged")
+    parser.add_argument("--mutations", type=int, default=2, help="card swaps per child")
+    parser.add_argument("--deck-size", type=int, default=cards.DECK_SIZE)
+    parser.add_argument("--max-copies", type=int, default=2, help="copies of one card allowed in a deck")
+    parser.add_argument("--games", type=int, default=2000, help="matches per gauntlet deck per candidate")
+    parser.add_argument("--max-turns", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", type=int, default=5, help="best decks to write")
+    parser.add_argument("--out", default="optimized_decks")
+    args = parser.parse_args(argv)
+
+    if args.population < 3:
+        parser.error("--population must be at least 3 for tournament selection")
+    if args.deck_size > args.max_copies * cards.DECK_SIZE:
+        parser.error("--deck-size needs more cards than --max-copies allows")
+    gauntlet = list(load_decks(args.gauntlet_dir).values()) if args.gauntlet_dir else [cards.new_deck()]
+    if not gauntlet:
+        parser.error(f"no deck files in {args.gauntlet_dir}")
+
+    with ProcessPoolExecutor(args.workers) as pool:
+        ranked = Optimizer(gauntlet, args, pool).run()
+    write_decks(ranked, args.out, args.keep)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,13 @@
 import pygame
-import sys
-import os
-
-def get_asset_path(relative_path):
-    """ Get the absolute path to an asset, works for dev and for PyInstaller bundled exe """
-    if hasattr(sys, '_MEIPASS'):
-        # Running as a bundled executable
-        base_path = sys._MEIPASS
-    else:
-        # Running in normal Python environment
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
+from collections import OrderedDict
+from functools import lru_cache
+
+from assets import load_icon, scale_cached
+from cards import IMAGE_KEYS, parse_card
 
 def card_name_to_filename(card_name):
     """Convert 'Ace of Spades' -> 'card_spades_A'"""
-    rank_map = {
-        "2": "02", "3": "03", "4": "04", "5": "05", "6": "06", "7": "07",
-        "8": "08", "9": "09", "10": "10",
-        "Jack": "J",  # ← map face cards
-        "Queen": "Q",
-        "King": "K",
-        "Ace": "A"
-    }
-    suit_map = {
-        "Hearts": "hearts",
-        "Diamonds": "diamonds",
-        "Clubs": "clubs",
-        "Spades": "spades"
-    }
-    rank, _, suit = card_name.partition(" of ")
-    return f"card_{suit_map[suit]}_{rank_map[rank]}"
+    return IMAGE_KEYS[parse_card(card_name)]
 
 class UI:
     def __init__(self, screen, width=1280, height=720):
@@ -43,11 +21,23 @@ class UI:
         self.BLACK = (0, 0, 0)
         self.BUTTON_COLOR = (0, 128, 255)
         self.BUTTON_HOVER_COLOR = (0, 255, 255)
+        self.TABLE_COLOR = (34, 139, 34)  # green table background
+        self.SLOT_COLOR = (200, 200, 200)
+
+        # 5 card boxes per hand, the enemy's along the top
+        box_width, box_height, spacing = 100, 145, 10
+        start_x = (width - (5 * box_width + 4 * spacing)) // 2
+        self.card_slots = [pygame.Rect(start_x + i * (box_width + spacing), height - box_height - 20, box_width, box_height)
+                           for i in range(5)]
+        self.enemy_card_slots = [slot.move(0, 20 - slot.y) for slot in self.card_slots]
 
         # Button setup
         self.button_rect = pygame.Rect(0, 0, 150, 50)
         self.reverse_button_rect = pygame.Rect(0, 0, 150, 50)
         self.play_button_rect = pygame.Rect(0, 0, 150, 50)
+        self.button_rect.topright = (width - 20, height - 70)
+        self.reverse_button_rect.topright = (width - 20, height - 140)
+        self.play_button_rect.topright = (width - 200, height - 140)
 
         self.button_color = (70, 130, 180)
         self.button_hover_color = (100, 160, 210)
@@ -56,29 +46,59 @@ class UI:
         self.new_card_index = 0
         self.deckbuilder_index = None
 
-        # Load and scale icons
-        path = get_asset_path('board_game_icons/PNG/Default (64px)/skull.png')
-        self.ui_poison = pygame.image.load(path)
-        path = get_asset_path('board_game_icons/PNG/Default (64px)/shield.png')
-        self.ui_shield = pygame.image.load(path)
-        self.ui_poison = pygame.transform.scale(self.ui_poison, (20, 20))
-        self.ui_shield = pygame.transform.scale(self.ui_shield, (20, 20))
+        # Deck builder grid: only DECK_ROWS rows are shown, from deck_scroll down
+        self.DECK_CARD_SIZE = (50, 70)
+        self.DECK_MARGIN = 10
+        self.DECK_COLUMNS = 13
+        self.DECK_ROWS = 5
+        self.deck_scroll = 0
+
+        # Icons at their display size, from the asset bundle when packaged
+        self.ui_poison = load_icon('board_game_icons/PNG/Default (64px)/skull.png', (20, 20))
+        self.ui_shield = load_icon('board_game_icons/PNG/Default (64px)/shield.png', (20, 20))
 
         self.clock = pygame.time.Clock()
 
-    def display_fps(self):
-        # Get the current FPS
-        fps = self.clock.get_fps()
+        # Static board layer, rebuilt when the screen size or colors change
+        self.board = None
+        self.board_key = None
+
+        # Rendered text surfaces, keyed by (font, text, antialias, color)
+        self.text_cache = OrderedDict()
+        self.TEXT_CACHE_SIZE = 256
+        self.text_cache_hits = 0
+        self.text_cache_misses = 0
+
+    def render_text(self, text, color, font=None, antialias=True):
+        """font.render through a bounded LRU cache"""
+        font = font or self.font
+        key = (font, text, antialias, tuple(color))
+        surface = self.text_cache.get(key)
+        if surface is not None:
+            self.text_cache_hits += 1
+            self.text_cache.move_to_end(key)
+            return surface
+
+        self.text_cache_misses += 1
+        surface = font.render(text, antialias, color)
+        self.text_cache[key] = surface
+        if len(self.text_cache) > self.TEXT_CACHE_SIZE:
+            self.text_cache.popitem(last=False)
+        return surface
+
+    def fps_label(self):
+        # Whole numbers only so the text cache can reuse it
+        return f"FPS: {self.clock.get_fps():.0f}"
 
-        # Render the FPS as text
-        fps_text = self.font.render(f"FPS: {fps:.4f}", True, (0, 0, 0))  # White color
+    def display_fps(self):
+        fps_text = self.render_text(self.fps_label(), (0, 0, 0))
 
         # Draw the FPS text in the top-right corner
         self.screen.blit(fps_text, (self.screen.get_width() - 120, 10))
 
     def draw_button(self, text, x, y, width, height, color):
         pygame.draw.rect(self.screen, color, (x, y, width, height))
-        label = self.font.render(text, True, self.BLACK)
+        label = self.render_text(text, self.BLACK)
         self.screen.blit(label, (x + (width - label.get_width()) // 2, y + (height - label.get_height()) // 2))
 
     # Check if mouse is over a button
@@ -102,48 +122,130 @@ class UI:
         self.draw_button("Options", 150, 500, 200, 50, options_color)
         self.draw_button("Quit", 150, 600, 200, 50, quit_color)
 
+    # -------------------------------
+    # Scene elements (see scene.py)
+    # -------------------------------
+    def main_elements(self, player, show_deck_builder):
+        """Regions of the main menu and the state each one is drawn from"""
+        elements = {
+            "background": (self.screen.get_rect(), "main"),
+            "fps": (pygame.Rect(self.WIDTH - 120, 10, 120, 30), self.fps_label()),
+        }
+        for y in (200, 300, 400, 500, 600):
+            elements[("menu_button", y)] = (pygame.Rect(150, y, 200, 50), self.button_hover(150, y, 200, 50))
+
+        if show_deck_builder:
+            modifier_hover = ()
+            if player.deckbuilder_selected_card is not None:
+                x, y = self.modifier_position()
+                modifier_hover = tuple(self.button_hover(x + 200, y + dy, 200, 50) for dy in (0, 50, 100, 150))
+            first, last = self.visible_deck_range(len(player.deck.cards))
+            state = (player.deck.cards[first:last], len(player.deck.cards), self.deck_scroll,
+                     tuple(sorted(player.deck.variants.items())),
+                     self.deckbuilder_index, player.deckbuilder_selected_card, self.new_card_index, modifier_hover)
+            elements["deck_builder"] = (pygame.Rect(400, 0, self.WIDTH - 400, self.HEIGHT), state)
+        return elements
+
+    def game_elements(self, player, enemy):
+        """Regions of UI.draw_game and the state each one is drawn from"""
+        stats = (player.life, player.poison, player.shield, enemy.life, enemy.poison, enemy.shield)
+        mana_width = max(420, 35 + 25 * max(player.mana, enemy.mana))
+        mouse_pos = pygame.mouse.get_pos()
+        return {
+            "fps": (pygame.Rect(self.WIDTH - 120, 10, 120, 30), self.fps_label()),
+            "stats": (pygame.Rect(0, 0, 175, self.HEIGHT), stats),
+            "mana": (pygame.Rect(30, self.HEIGHT // 2 - 35, mana_width, 70), (player.mana, enemy.mana)),
+            "draw_button": (self.button_rect, self.button_rect.collidepoint(mouse_pos)),
+            "reverse_button": (self.reverse_button_rect, self.reverse_button_rect.collidepoint(mouse_pos)),
+            "play_button": (self.play_button_rect, self.play_button_rect.collidepoint(mouse_pos)),
+        }
+
+    def deck_grid_position(self, i):
+        """Top-left of the i-th card in the deck builder grid, or None when scrolled out"""
+        card_width, card_height = self.DECK_CARD_SIZE
+        row = i // self.DECK_COLUMNS - self.deck_scroll
+        col = i % self.DECK_COLUMNS
+        if not 0 <= row < self.DECK_ROWS:
+            return None
+        return (col * (card_width + self.DECK_MARGIN) + self.DECK_MARGIN + 400,
+                row * (card_height + self.DECK_MARGIN) + self.DECK_MARGIN)
+
+    def deck_grid_index(self, pos, deck_size):
+        """Index of the card under ``pos`` in the deck builder grid, or None"""
+        card_width, card_height = self.DECK_CARD_SIZE
+        x = pos[0] - 400 - self.DECK_MARGIN
+        y = pos[1] - self.DECK_MARGIN
+        if x < 0 or y < 0:
+            return None
+        col, x_in_cell = divmod(x, card_width + self.DECK_MARGIN)
+        row, y_in_cell = divmod(y, card_height + self.DECK_MARGIN)
+        if col >= self.DECK_COLUMNS or row >= self.DECK_ROWS or x_in_cell >= card_width or y_in_cell >= card_height:
+            return None
+        i = (row + self.deck_scroll) * self.DECK_COLUMNS + col
+        return i if i < deck_size else None
+
+    def visible_deck_range(self, deck_size):
+        """(first, last) indices of the cards in the visible rows"""
+        max_scroll = max(0, -(-deck_size // self.DECK_COLUMNS) - self.DECK_ROWS)
+        self.deck_scroll = min(max(self.deck_scroll, 0), max_scroll)
+        first = self.deck_scroll * self.DECK_COLUMNS
+        return first, min(deck_size, first + self.DECK_ROWS * self.DECK_COLUMNS)
+
     def draw_deck_builder(self, player):
-        CARD_WIDTH = 50
-        CARD_HEIGHT = 70
-        CARD_MARGIN = 10
-
-        # Loop over the card slots and display images
-        for i, image in enumerate(player.deck.cards):
-            # Calculate the grid position
-            row = i // 13  # 4 rows, each with 13 cards
-            col = i % 13  # 13 columns
-            x_pos = col * (CARD_WIDTH + CARD_MARGIN) + CARD_MARGIN + 400
-            y_pos = row * (CARD_HEIGHT + CARD_MARGIN) + CARD_MARGIN
-
-            card_key = card_name_to_filename(image)
-            card_img = player.deck.images.get(card_key)
-            self.screen.blit(card_img, (x_pos, y_pos))
-            if self.deckbuilder_index == i:
-                card_rect = card_img.get_rect(topleft=(x_pos+1, y_pos+3))
-                card_rect = card_rect.inflate(-27, -4)
-                pygame.draw.rect(self.screen, (255, 215, 0), card_rect, 5)
-
-            if pygame.mouse.get_pressed()[0]:  # Left mouse click
-                mouse_pos = pygame.mouse.get_pos()
-                card_rect = pygame.Rect(x_pos, y_pos, CARD_WIDTH, CARD_HEIGHT)
-
-                if card_rect.collidepoint(mouse_pos):
-                    player.deckbuilder_selected_card_key = card_key
-                    self.deckbuilder_index = row * 13 + col
-
-        if player.deckbuilder_selected_card_key:
+        first, last = self.visible_deck_range(len(player.deck.cards))
+
+        # Only the visible rows, as thumbnails, in one blits call
+        grid = [(player.deck.image(card, self.DECK_CARD_SIZE), self.deck_grid_position(i))
+                for i, card in enumerate(player.deck.cards[first:last], first)]
+        self.screen.blits(grid, False)
+
+        if self.deckbuilder_index is not None and first <= self.deckbuilder_index < last:
+            card_rect = pygame.Rect(self.deck_grid_position(self.deckbuilder_index), self.DECK_CARD_SIZE)
+            pygame.draw.rect(self.screen, (255, 215, 0), card_rect, 3)
+
+        # Scrollbar once the deck has more rows than fit
+        rows = -(-len(player.deck.cards) // self.DECK_COLUMNS)
+        if rows > self.DECK_ROWS:
+            track = pygame.Rect(self.WIDTH - 12, self.DECK_MARGIN, 6, self.DECK_ROWS * (self.DECK_CARD_SIZE[1] + self.DECK_MARGIN))
+            thumb = pygame.Rect(track.x, track.y + track.height * self.deck_scroll // rows,
+                                track.width, max(10, track.height * self.DECK_ROWS // rows))
+            pygame.draw.rect(self.screen, (200, 200, 200), track, border_radius=3)
+            pygame.draw.rect(self.screen, self.BUTTON_COLOR, thumb, border_radius=3)
+
+        if player.deckbuilder_selected_card is not None:
             self.card_modifier(player)
             self.draw_swap_menu(player)
 
+    def deck_builder_event(self, player, event):
+        """Handle a click or scroll in the open deck builder"""
+        if event.type == pygame.MOUSEWHEEL:
+            self.deck_scroll -= event.y
+            self.visible_deck_range(len(player.deck.cards))
+            return
+        if event.type != pygame.MOUSEBUTTONDOWN or event.button != 1:
+            return
+
+        i = self.deck_grid_index(event.pos, len(player.deck.cards))
+        if i is not None:
+            player.deckbuilder_selected_card = player.deck.cards[i]
+            self.deckbuilder_index = i
+
+        if player.deckbuilder_selected_card is not None:
+            self.card_modifier_event(player, event)
+
+    def modifier_position(self):
+        enlarged_x_pos = self.screen.get_width() // 2 - 150 // 2  # Center horizontally
+        enlarged_y_pos = self.screen.get_height() - 250  # Position a little above the bottom
+        return enlarged_x_pos, enlarged_y_pos
+
     def card_modifier(self, player):
 
         if self.new_card_deck is None:
             self.new_card_deck = player.deck.create_new_deck()
 
-        enlarged_x_pos = self.screen.get_width() // 2 - 150 // 2  # Center horizontally
-        enlarged_y_pos = self.screen.get_height() - 250  # Position a little above the bottom
-        card_img = player.deck.images.get(player.deckbuilder_selected_card_key)
-        self.screen.blit(pygame.transform.scale(card_img, (150, 150)), (enlarged_x_pos, enlarged_y_pos))
+        enlarged_x_pos, enlarged_y_pos = self.modifier_position()
+        card_img = player.deck.image(player.deckbuilder_selected_card)
+        self.screen.blit(scale_cached(card_img, (150, 150)), (enlarged_x_pos, enlarged_y_pos))
 
         level_color = self.BUTTON_HOVER_COLOR if self.button_hover(enlarged_x_pos + 200, enlarged_y_pos, 200, 50) else self.BUTTON_COLOR
         swap_color = self.BUTTON_HOVER_COLOR if self.button_hover(enlarged_x_pos + 200, enlarged_y_pos+50, 200, 50) else self.BUTTON_COLOR
@@ -155,45 +257,46 @@ class UI:
         self.draw_button("Reverse", enlarged_x_pos + 200, enlarged_y_pos+100, 200, 50, reverse_color)
         self.draw_button("Save", enlarged_x_pos + 200, enlarged_y_pos+150, 200, 50, save_color)
 
-        for event in pygame.event.get():  # Left mouse click
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                # LEVEL UP
-                if self.button_hover(enlarged_x_pos + 200, enlarged_y_pos, 200, 50):
-                    print('LEVEL UP')
-                # SWAP
-                if self.button_hover(enlarged_x_pos + 200, enlarged_y_pos + 50, 200, 50):
-                    print('SWAP')
-                    swapped_in = player.deck.swap_card(player.deckbuilder_selected_card_key, self.deckbuilder_index, self.new_card_deck[self.new_card_index])
-                    print(swapped_in)
-                    player.deckbuilder_selected_card_key = card_name_to_filename(swapped_in)
-                # REVERSE
-                if self.button_hover(enlarged_x_pos + 200, enlarged_y_pos + 100, 200, 50):
-                    # card_key = card_name_to_filename(player.deckbuilder_selected_card_image)
-                    if player.deckbuilder_selected_card_key in player.deck.images:
-                        player.deck.invert_card_colors(player.deckbuilder_selected_card_key)
-
-                # SAVE
-                if self.button_hover(enlarged_x_pos + 200, enlarged_y_pos + 150, 200, 50):
-                    player.deckbuilder_selected_card_key = None
-
-                # ARROW LEFT
-                if self.button_hover(1039, 535, 50, 50):
-                    self.new_card_index -= 1
-                    if self.new_card_index < 0:
-                        self.new_card_index = len(player.deck.cards) - self.new_card_index
-                if self.button_hover(1165, 535, 50, 50):
-                    self.new_card_index += 1
-                    if self.new_card_index > len(player.deck.cards) - 1:
-                        self.new_card_index = 0
+    def card_modifier_event(self, player, event):
+        if self.new_card_deck is None:
+            self.new_card_deck = player.deck.create_new_deck()
+
+        enlarged_x_pos, enlarged_y_pos = self.modifier_position()
+        # LEVEL UP
+        if self.button_hover(enlarged_x_pos + 200, enlarged_y_pos, 200, 50):
+            print('LEVEL UP')
+            player.deck.level_up_card(player.deckbuilder_selected_card)
+        # SWAP
+        if self.button_hover(enlarged_x_pos + 200, enlarged_y_pos + 50, 200, 50):
+            print('SWAP')
+            swapped_in = player.deck.swap_card(player.deckbuilder_selected_card, self.deckbuilder_index, self.new_card_deck[self.new_card_index])
+            player.deckbuilder_selected_card = swapped_in
+        # REVERSE
+        if self.button_hover(enlarged_x_pos + 200, enlarged_y_pos + 100, 200, 50):
+            if player.deckbuilder_selected_card is not None:
+                player.deck.invert_card_colors(player.deckbuilder_selected_card)
+
+        # SAVE
+        if self.button_hover(enlarged_x_pos + 200, enlarged_y_pos + 150, 200, 50):
+            player.deckbuilder_selected_card = None
+
+        # ARROW LEFT
+        if self.button_hover(1039, 535, 50, 50):
+            self.new_card_index -= 1
+            if self.new_card_index < 0:
+                self.new_card_index = len(player.deck.cards) - self.new_card_index
+        if self.button_hover(1165, 535, 50, 50):
+            self.new_card_index += 1
+            if self.new_card_index > len(player.deck.cards) - 1:
+                self.new_card_index = 0
 
 
     def draw_swap_menu(self, player):
         enlarged_x_pos = self.screen.get_width() // 2 + 450 // 2  # Center horizontally
         enlarged_y_pos = self.screen.get_height() - 250  # Position a little above the bottom
         swap_card = self.new_card_deck[self.new_card_index]
-        card_key = card_name_to_filename(swap_card)
-        card_img = player.deck.images.get(card_key)
-        self.screen.blit(pygame.transform.scale(card_img, (150, 150)), (enlarged_x_pos + 174, enlarged_y_pos))
+        card_img = player.deck.image(swap_card)
+        self.screen.blit(scale_cached(card_img, (150, 150)), (enlarged_x_pos + 174, enlarged_y_pos))
 
         # Arrows
         center_back = pygame.Vector2(enlarged_x_pos + 199, enlarged_y_pos + 65)
@@ -203,6 +306,45 @@ class UI:
         draw_arrow(self.screen, center_back, end_back, pygame.Color(0, 0, 0), 10, 20, 12)
         draw_arrow(self.screen, center_forward, end_forward, pygame.Color(0, 0, 0), 10, 20, 12)
 
+    def board_layer(self):
+        """Everything on the board that doesn't change during a match"""
+        key = (self.screen.get_size(), self.TABLE_COLOR, self.SLOT_COLOR)
+        if self.board is not None and self.board_key == key:
+            return self.board
+
+        board = pygame.Surface(self.screen.get_size()).convert()
+        board.fill(self.TABLE_COLOR)
+
+        # Empty card boxes
+        for slot in self.card_slots + self.enemy_card_slots:
+            pygame.draw.rect(board, self.SLOT_COLOR, slot, border_radius=5)
+            pygame.draw.rect(board, (0, 0, 0), slot, 3, border_radius=5)
+
+        # Mana frames
+        for rect in self.mana_frames():
+            pygame.draw.rect(board, (0, 0, 0), rect, 2)
+
+        # Poison and shield icons
+        board.blit(self.ui_poison, (70, self.HEIGHT - 5 - 20))
+        board.blit(self.ui_shield, (120, self.HEIGHT - 5 - 20))
+        board.blit(self.ui_poison, (70, 2))
+        board.blit(self.ui_shield, (120, 2))
+
+        self.board = board
+        self.board_key = key
+        return board
+
+    def draw_board(self):
+        self.screen.blit(self.board_layer(), (0, 0))
+
+    def mana_frames(self):
+        """Player and enemy mana frame rects"""
+        circle_radius = 10
+        circle_spacing = 25
+        width = 15 * circle_spacing + circle_radius * 2
+        return (pygame.Rect(50, self.HEIGHT / 2 - circle_radius / 2 + 15, width, circle_radius * 2),
+                pygame.Rect(50, self.HEIGHT / 2 - circle_radius / 2 - 15, width, circle_radius * 2))
+
     def draw_game(self, player, enemy):
         screen = self.screen
         font = self.font
@@ -217,20 +359,20 @@ class UI:
         num_circles_player = player.mana
         num_circles_enemy = enemy.mana
 
-        # Draw the line of circles
-        y = HEIGHT / 2 - circle_radius / 2 + 15
+        # Draw the line of circles; the frames come from the board layer but
+        # are traced again over the circles so they stay on top
+        player_frame, enemy_frame = self.mana_frames()
         for i in range(num_circles_player):
             x = 50 + i * circle_spacing
-            pygame.draw.circle(screen, (0, 0, 0), (x, y), circle_radius)
-        pygame.draw.rect(screen, (0, 0, 0),
-                         pygame.Rect(50, y, 15 * circle_spacing + circle_radius * 2, circle_radius * 2), 2)
+            pygame.draw.circle(screen, (0, 0, 0), (x, player_frame.y), circle_radius)
+        if num_circles_player > 0:
+            pygame.draw.rect(screen, (0, 0, 0), player_frame, 2)
 
-        y = HEIGHT / 2 - circle_radius / 2 - 15
         for i in range(num_circles_enemy):
             x = 50 + i * circle_spacing
-            pygame.draw.circle(screen, (0, 0, 0), (x, y), circle_radius)
-        pygame.draw.rect(screen, (0, 0, 0),
-                         pygame.Rect(50, y, 15 * circle_spacing + circle_radius * 2, circle_radius * 2), 2)
+            pygame.draw.circle(screen, (0, 0, 0), (x, enemy_frame.y), circle_radius)
+        if num_circles_enemy > 0:
+            pygame.draw.rect(screen, (0, 0, 0), enemy_frame, 2)
 
         # --- Lifebars ---
         lifebar_player = pygame.Rect(0, 0, 30, player.life)
@@ -239,11 +381,6 @@ class UI:
         lifebar_enemy = pygame.Rect(0, 0, 30, enemy.life)
         lifebar_enemy.topleft = (20, 25)
 
-        screen.blit(self.ui_poison, (70, HEIGHT - 5 - 20))
-        screen.blit(self.ui_shield, (120, HEIGHT - 5 - 20))
-        screen.blit(self.ui_poison, (70, 2))
-        screen.blit(self.ui_shield, (120, 2))
-
         pygame.draw.rect(screen, (255, 255, 255), lifebar_player, border_radius=10)
         pygame.draw.rect(screen, (255, 255, 255), lifebar_enemy, border_radius=10)
 
@@ -261,29 +398,61 @@ class UI:
         mouse_pos = pygame.mouse.get_pos()
 
         # Draw Card Button
-        self.button_rect.topright = (WIDTH - 20, HEIGHT - 70)
         color = self.button_hover_color if self.button_rect.collidepoint(mouse_pos) else self.button_color
         self.draw_button("Draw Card", self.button_rect.x, self.button_rect.y, self.button_rect.width, self.button_rect.height, color)
 
         # Reverse Button
-        self.reverse_button_rect.topright = (WIDTH - 20, HEIGHT - 140)
         color = self.button_hover_color if self.reverse_button_rect.collidepoint(mouse_pos) else self.button_color
         self.draw_button("Reverse", self.reverse_button_rect.x, self.reverse_button_rect.y, self.reverse_button_rect.width, self.reverse_button_rect.height, color)
 
         # Play Button
-        self.play_button_rect.topright = (WIDTH - 200, HEIGHT - 140)
         color = self.button_hover_color if self.play_button_rect.collidepoint(mouse_pos) else self.button_color
         self.draw_button("Play", self.play_button_rect.x, self.play_button_rect.y, self.play_button_rect.width, self.play_button_rect.height, color)
 
 
+    def draw_card_slots(self, player, enemy, played_card=None, played_deck=None, enemy_preview=None):
+        """Both hands, the played card in the center and the enemy's drawn card"""
+        screen = self.screen
+        last_cards = player.drawn_cards
+        enemy_last_cards = enemy.drawn_cards
+
+        # Empty boxes come from the board layer, only highlights are drawn here
+        for i, card in enumerate(last_cards):
+            if card == player.selected_card and i == player.selected_card_position:
+                pygame.draw.rect(screen, (255, 215, 0), self.card_slots[i], 3, border_radius=5)
+        for i, card in enumerate(enemy_last_cards):
+            if card == enemy.selected_card:
+                pygame.draw.rect(screen, (255, 215, 0), self.enemy_card_slots[i], 3, border_radius=5)
+
+        # Hands, played card and enemy preview don't overlap, so they go out in one blits call
+        card_blits = []
+        for i, card in enumerate(last_cards):
+            card_img = player.deck.image(card)
+            card_blits.append((card_img, card_img.get_rect(center=self.card_slots[i].center)))
+        for i, card in enumerate(enemy_last_cards):
+            card_img = enemy.deck.image(card)
+            card_blits.append((card_img, card_img.get_rect(center=self.enemy_card_slots[i].center)))
+
+        if played_card is not None:
+            # Scale to fit nicely in the center
+            center_img = scale_cached(played_deck.image(played_card), (200, 290))  # adjust size
+            card_blits.append((center_img, center_img.get_rect(center=(self.WIDTH // 2, self.HEIGHT // 2))))
+
+        if enemy_preview is not None:
+            # Draw on the left side
+            enemy_img = scale_cached(enemy.deck.image(enemy_preview), (100, 145))  # adjust size
+            card_blits.append((enemy_img, enemy_img.get_rect(midleft=(20, self.HEIGHT // 2))))
+
+        screen.blits(card_blits, False)
+
     def draw_value_text(self, font, text, x, y, color):
-        value_text = font.render(text, True, color)
+        value_text = self.render_text(text, color, font)
         text_rect = value_text.get_rect(center=(x, y))
         self.screen.blit(value_text, text_rect)
 
     def draw_end_screen(self, player_won):
-        win_text = self.font.render(f"YOU {'WIN' if player_won else 'LOSE'}!", True, self.WHITE)
-        sub_text = self.font.render("Press any key to exit...", True, self.WHITE)
+        win_text = self.render_text(f"YOU {'WIN' if player_won else 'LOSE'}!", self.WHITE)
+        sub_text = self.render_text("Press any key to exit...", self.WHITE)
         self.screen.fill(self.BLACK)
         self.screen.blit(win_text, (self.WIDTH // 2 - win_text.get_width() // 2, self.HEIGHT // 3))
         self.screen.blit(sub_text, (self.WIDTH // 2 - sub_text.get_width() // 2, self.HEIGHT // 2))
@@ -309,6 +478,20 @@ def draw_arrow(
         head_width (int, optional): Defaults to 4.
         head_height (float, optional): Defaults to 2.
     """
+    head_verts, body_verts = arrow_polygons(tuple(start), tuple(end), body_width, head_width, head_height)
+    pygame.draw.polygon(surface, color, head_verts)
+    if body_verts:
+        pygame.draw.polygon(surface, color, body_verts)
+
+
+@lru_cache(maxsize=64)
+def arrow_polygons(start, end, body_width, head_width, head_height):
+    """Head and body vertices of an arrow, computed once per position.
+
+    The body is None when the arrow is shorter than its head.
+    """
+    start = pygame.Vector2(start)
+    end = pygame.Vector2(end)
     arrow = start - end
     angle = arrow.angle_to(pygame.Vector2(0, -1))
     body_length = arrow.length() - head_height
@@ -326,9 +509,8 @@ def draw_arrow(
         head_verts[i] += translation
         head_verts[i] += start
 
-    pygame.draw.polygon(surface, color, head_verts)
-
     # Stop weird shapes when the arrow is shorter than arrow head
+    body_verts = None
     if arrow.length() >= head_height:
         # Calculate the body rect, rotate and translate into place
         body_verts = [
@@ -342,5 +524,6 @@ def draw_arrow(
             body_verts[i].rotate_ip(-angle)
             body_verts[i] += translation
             body_verts[i] += start
+        body_verts = tuple(tuple(v) for v in body_verts)
 
-        pygame.draw.polygon(surface, color, body_verts)
\ No newline at end of file
+    return tuple(tuple(v) for v in head_verts), body_verts
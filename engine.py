@@ -0,0 +1,186 @@
+"""Headless rules engine for the card game.
+
+Holds the combat rules and the turn/draw flow of ``game.py`` without any
+pygame dependency, so full matches can be played with no window.  The
+interactive game drives the same functions with ``Character`` objects; the
+simulators drive them with ``Side`` objects.  A side is anything with
+``life``, ``poison``, ``shield``, ``mana``, ``damage_value``, a ``deck``
+with ``draw(n)`` and a ``drawn_cards`` Hand.
+"""
+from pile import CardPile, Hand
+from rules import load_rules
+from seeding import MatchStreams
+
+STARTING_LIFE = 100
+STARTING_HAND = 3
+HAND_SIZE = 5
+PLAYER_START_MANA = 1
+ENEMY_START_MANA = 0
+# Cards drawn by a side when its turn begins
+PLAYER_TURN_DRAW = 1
+ENEMY_TURN_DRAW = 10
+
+# What each card costs and does, compiled once from the rules file
+CARD_RULES = load_rules()
+CARD_PLAYS = CARD_RULES.plays
+
+
+class Side:
+    """Combat state of one participant in a headless match."""
+
+    def __init__(self, cards, mana=PLAYER_START_MANA):
+        self.deck = CardPile(cards)
+        self.drawn_cards = Hand(HAND_SIZE)
+        self.life = STARTING_LIFE
+        self.poison = 0
+        self.shield = 0
+        self.damage_value = 0
+        self.mana = mana
+
+
+# -------------------------------
+# Rules
+# -------------------------------
+def draw_into_hand(side, n=1):
+    """Draw up to ``n`` cards one at a time; a full hand drops its oldest card."""
+    drawn = side.deck.draw(min(n, len(side.deck)))
+    for card in drawn:
+        side.drawn_cards.append(card)
+    return drawn
+
+
+def calc_damage(side, card, enemy):
+    """Pay for ``card`` and apply its compiled effects (card_rules.json, see rules.py)."""
+    CARD_PLAYS[card](side, enemy)
+
+
+def resolve_turn(side, enemy):
+    """Apply poison, damage and decay at the end of ``side``'s turn."""
+    enemy.life -= enemy.poison
+
+    enemy.life = enemy.life - max(0, side.damage_value - enemy.shield)
+    enemy.shield = max(0, enemy.shield - 2)
+    side.poison = max(0, side.poison - 2)
+
+    if side.mana < 0:
+        enemy.mana = abs(side.mana)
+
+    side.damage_value = 0
+
+
+# -------------------------------
+# Match state and transitions
+# -------------------------------
+class MatchState:
+    def __init__(self, player, enemy, seed=None):
+        self.player = player
+        self.enemy = enemy
+        self.seed = seed  # replays the match together with the decks and actions
+        self.player_turn = True
+        self.turns = 0
+
+    @property
+    def active(self):
+        return self.player if self.player_turn else self.enemy
+
+    @property
+    def opponent(self):
+        return self.enemy if self.player_turn else self.player
+
+    @property
+    def turn_over(self):
+        return self.active.mana < 0
+
+    @property
+    def finished(self):
+        return self.player.life <= 0 or self.enemy.life <= 0
+
+    @property
+    def winner(self):
+        """'player', 'enemy' or None while the match is still running."""
+        if not self.finished:
+            return None
+        return "player" if self.enemy.life < self.player.life else "enemy"
+
+
+def new_match(player_cards, enemy_cards, streams=None):
+    """Shuffle both decks from ``streams`` (a seeding.MatchStreams) and deal."""
+    streams = streams or MatchStreams()
+    player = Side(player_cards, PLAYER_START_MANA)
+    enemy = Side(enemy_cards, ENEMY_START_MANA)
+    for side, rng in ((player, streams.player_deck), (enemy, streams.enemy_deck)):
+        side.deck.shuffle(rng)
+        draw_into_hand(side, STARTING_HAND)
+    return MatchState(player, enemy, streams.seed)
+
+
+def apply_play(state, index):
+    """Active side plays the card at ``index`` of its hand."""
+    side = state.active
+    card = side.drawn_cards.pop(index)
+    calc_damage(side, card, state.opponent)
+    return card
+
+
+def apply_draw(state):
+    """Active side pays one mana to draw a card."""
+    side = state.active
+    side.mana -= 1
+    return draw_into_hand(side, 1)
+
+
+def end_turn(state):
+    """Hand the turn over: the next side draws, the finished side resolves.
+
+    Returns the cards drawn by the side whose turn begins.
+    """
+    side, enemy = state.active, state.opponent
+    drawn = draw_into_hand(enemy, ENEMY_TURN_DRAW if state.player_turn else PLAYER_TURN_DRAW)
+    resolve_turn(side, enemy)
+    state.player_turn = not state.player_turn
+    state.turns += 1
+    return drawn
+
+
+# -------------------------------
+# Headless play
+# -------------------------------
+def random_policy(state, rng):
+    """The enemy's behaviour in game.py: play a random card, draw when empty."""
+    hand = state.active.drawn_cards
+    if hand:
+        return "play", rng.randrange(len(hand))
+    return "draw", None
+
+
+def play_match(player_cards, enemy_cards, player_policy=random_policy,
+               enemy_policy=random_policy, seed=None, max_turns=500, streams=None):
+    """Play a full match and return the final ``MatchState``.
+
+    The same ``seed`` (or ``streams``) replays the same match.  Matches still
+    running after ``max_turns`` turns are left unfinished (``winner`` is
+    None), e.g. when both decks have run dry.
+    """
+    streams = streams or MatchStreams(seed)
+    state = new_match(player_cards, enemy_cards, streams)
+    while not state.finished and state.turns < max_turns:
+        if state.player_turn:
+            action, index = player_policy(state, streams.player_ai)
+        else:
+            action, index = enemy_policy(state, streams.enemy_ai)
+        if action == "play":
+            apply_play(state, index)
+        else:
+            apply_draw(state)
+        if state.turn_over:
+            end_turn(state)
+    return state
+
+
+if __name__ == "__main__":
+    from cards import new_deck
+
+    wins = {"player": 0, "enemy": 0, None: 0}
+    for i in range(1000):
+        wins[play_match(new_deck(), new_deck(), seed=i).winner] += 1
+    print(wins)
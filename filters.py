@@ -0,0 +1,74 @@
+"""Card image filters working in place on surfarray pixel views.
+
+A filter takes an ``rgb`` view shaped ``(..., width, height, 3)`` and the
+matching ``alpha`` view shaped ``(..., width, height)`` and edits them in
+place.  The leading axes let one call cover every tile of a card sheet at
+once (see ``apply_to_sheet``).
+
+Filter chains are tuples of names from ``FILTERS``; ``canonical_chain`` puts
+them in a fixed order so the same look always has the same cache key.
+"""
+import numpy as np
+import pygame
+
+HIGHLIGHT_COLOR = (255, 215, 0)
+BADGE_COLOR = (255, 190, 0)
+BADGE_MARK_COLOR = (255, 255, 255)
+
+
+def invert(rgb, alpha):
+    np.subtract(255, rgb, out=rgb)
+
+
+def tint(rgb, alpha, color=HIGHLIGHT_COLOR, strength=90):
+    """Blend towards ``color`` by ``strength``/256"""
+    shifted = rgb.astype(np.int16)
+    shifted += ((np.array(color, dtype=np.int16) - shifted) * strength) >> 8
+    rgb[...] = shifted
+
+
+def level_up_badge(rgb, alpha):
+    """A round badge with an up arrow in the top-right corner"""
+    width, height = rgb.shape[-3], rgb.shape[-2]
+    radius = max(3, min(width, height) // 7)
+    cx, cy = width - radius - width // 8, radius + height // 10
+    xs = np.arange(width)[:, None] - cx
+    ys = np.arange(height)[None, :] - cy
+
+    disc = xs * xs + ys * ys <= radius * radius
+    arrow = (ys >= -radius // 2) & (ys <= radius // 2) & (2 * np.abs(xs) <= ys + radius // 2)
+
+    rgb[..., disc, :] = BADGE_COLOR
+    rgb[..., arrow & disc, :] = BADGE_MARK_COLOR
+    alpha[..., disc] = 255
+
+
+# Application order of a chain
+FILTERS = {
+    "level_up": level_up_badge,
+    "tint": tint,
+    "invert": invert,
+}
+
+
+def canonical_chain(names):
+    """Filter names in FILTERS order, or None for the plain image"""
+    chain = tuple(name for name in FILTERS if name in names)
+    return chain or None
+
+
+def apply_to_sheet(sheet, tile_size, chain):
+    """Run ``chain`` over every tile of a card sheet in one pass per filter"""
+    tile_width, tile_height = tile_size
+    cols = sheet.get_width() // tile_width
+    rows = sheet.get_height() // tile_height
+
+    # (cols * w, rows * h) -> (cols, rows, w, h): still views into the sheet
+    rgb = pygame.surfarray.pixels3d(sheet)
+    alpha = pygame.surfarray.pixels_alpha(sheet)
+    tiles_rgb = rgb.reshape(cols, tile_width, rows, tile_height, 3).transpose(0, 2, 1, 3, 4)
+    tiles_alpha = alpha.reshape(cols, tile_width, rows, tile_height).transpose(0, 2, 1, 3)
+    for name in chain:
+        FILTERS[name](tiles_rgb, tiles_alpha)
+    # Release the pixel views so the sheet unlocks
+    del rgb, alpha, tiles_rgb, tiles_alpha
@@ -1,9 +1,21 @@
+import os
 import pygame
-import random
 import sys
-
-from drawing import UI, draw_arrow, card_name_to_filename
+import time
+
+import engine
+from assets import get_asset_path
+from cards import parse_card, read_deck_file
+from drawing import UI, draw_arrow
+import lethal
+import replay
 from character import Character
+from pacing import FrameScheduler
+from profiler import FrameProfiler
+from scene import Scene
+import search_ai
+from seeding import MatchStreams
+from tasks import TASK_DONE, TaskRunner
 
 
 def select_card(mouse_pos, last_cards, start_x, y_pos, box_width=100, box_height=145, spacing=10):
@@ -18,13 +30,13 @@ def select_card(mouse_pos, last_cards, start_x, y_pos, box_width=100, box_height
         spacing: space between boxes
 
     Returns:
-        The card name if a box was clicked, otherwise None
+        (card name, slot index) if a box was clicked, otherwise (None, None)
     """
     for i in range(len(last_cards)):
         rect = pygame.Rect(start_x + i * (box_width + spacing), y_pos, box_width, box_height)
         if rect.collidepoint(mouse_pos):
             return last_cards[i], i  # return the card clicked
-    return None
+    return None, None
 
 
 # -------------------------------
@@ -38,147 +50,229 @@ pygame.display.set_caption("Card Draw Game")
 font = pygame.font.SysFont(None, 32)
 
 ui = UI(screen)
-player = Character()
-enemy = Character()
+profiler = FrameProfiler()
+scene = Scene(screen, profiler)
+frames = FrameScheduler(ui.clock)
+tasks = TaskRunner()  # deck loading and enemy moves, off the render loop
+# CARD_GAME_SEED replays a match: same seed, decks and clicks give the same game
+# (the enemy's search then runs on a node budget instead of the clock)
+streams = MatchStreams(int(os.environ["CARD_GAME_SEED"]) if "CARD_GAME_SEED" in os.environ else None)
+print('Match seed:', streams.seed)
+player = Character(streams.player_deck)
+enemy = Character(streams.enemy_deck)
+# CARD_GAME_AI=easy|normal|hard|expert, see search_ai.DIFFICULTIES
+enemy_ai = search_ai.SearchAI.for_difficulty(os.environ.get("CARD_GAME_AI", search_ai.DEFAULT_DIFFICULTY),
+                                             fixed_nodes="CARD_GAME_SEED" in os.environ)
+# CARD_GAME_HINTS=1 marks a card that wins this turn for certain, see lethal.py
+show_hints = os.environ.get("CARD_GAME_HINTS") == "1"
+lethal_table = None
+if enemy_ai is not None or show_hints:
+    lethal_table = lethal.load_table()
+    if lethal_table is None:
+        # Packaged builds ship the table; from source it is built once, off the render loop
+        tasks.submit("lethal", lethal.build_table)
+
+
+def with_profiler_graph(elements):
+    """Add the profiler graph, redrawn every frame while it is shown"""
+    if profiler.show_graph:
+        elements["profiler"] = (profiler.graph_rect(screen), profiler.frames)
+    return elements
+
+
+def draw_menu():
+    ui.draw_main()
+    if show_deck_builder:
+        ui.draw_deck_builder(player)
+    profiler.draw_graph(screen)
+
 
 ### MAIN MENU
 main_menu = True
 show_deck_builder = False
 while main_menu:
-    ui.draw_main()
-
-    if show_deck_builder:
-        ui.draw_deck_builder(player)
-
-    for event in pygame.event.get():
+    profiler.begin_frame()
+    scene.draw(scene.update(with_profiler_graph(ui.main_elements(player, show_deck_builder))), draw_menu)
+
+    events = frames.events()
+    profiler.mark("wait")
+    for event in events:
+        if profiler.handle_event(event):
+            continue
         if event.type == pygame.QUIT:
             pygame.quit()
             sys.exit()
 
+        if event.type == TASK_DONE and tasks.collect(event):
+            if event.name == "load_deck":
+                player.deck.set_cards(event.result)
+                player.drawn_cards.clear()
+                engine.draw_into_hand(player, engine.STARTING_HAND)
+                print('Deck loaded')
+            elif event.name == "lethal":
+                lethal_table = event.result
+
+        if show_deck_builder:
+            ui.deck_builder_event(player, event)
+
         # Mouse click events
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if ui.button_hover(150, 200, 200, 50):  # Start Game
                 print("Start Game clicked")
                 main_menu = False
+                tasks.cancel("load_deck")
                 # Call the function to start the game (you can transition here)
             elif ui.button_hover(150, 300, 200, 50):  # Deck
                 print("Deckbuilder clicked")
                 show_deck_builder = not show_deck_builder
-                player.deckbuilder_selected_card_key = None
+                player.deckbuilder_selected_card = None
             elif ui.button_hover(150, 400, 200, 50):
-                player.deck.load_deck('test_deck.txt')
-                player.drawn_cards = []
-                player.drawn_cards.extend(player.deck.draw(3))
-                print('Deck loaded')
+                tasks.submit("load_deck", read_deck_file, get_asset_path('test_deck.txt'))
             elif ui.button_hover(150, 500, 200, 50):  # Options
                 print("Options clicked")
                 # You can create an options menu here
             elif ui.button_hover(150, 600, 200, 50):  # Quit
                 pygame.quit()
                 sys.exit()
-
-    pygame.display.flip()
-    ui.clock.tick(60)
+    profiler.mark("events")
 
 ### MAIN GAME
 # player.deck.load_deck('test_deck.txt')
-enemy.mana = 0
+enemy.mana = engine.ENEMY_START_MANA
+match = engine.MatchState(player, enemy, streams.seed)
+
+# Every match is recorded for replay.py; CARD_GAME_RECORDINGS= (empty) turns it off
+recording_dir = os.environ.get("CARD_GAME_RECORDINGS", "recordings")
+recording_path = None
+if recording_dir:
+    os.makedirs(recording_dir, exist_ok=True)
+    recording_path = os.path.join(recording_dir, time.strftime("match_%Y%m%d_%H%M%S") + f"_{os.getpid()}.cgr")
+recorder = replay.MatchRecorder(recording_path, streams.seed, player, enemy)
 
 enemy_turn_step = None
+enemy_move_requested = False
+enemy_card = None
+enemy_preview = None  # card shown left of the board during the enemy turn
 
 played_card = None
-player_turn = True
 
-# -------------------------------
-# Main loop
-# -------------------------------
-running = True
-while running:
-    screen.fill((34, 139, 34))  # green table background
+# --- 5 card boxes per hand
+start_x, y_pos = ui.card_slots[0].topleft
+hand_rect = ui.card_slots[0].unionall(ui.card_slots)
+enemy_hand_rect = ui.enemy_card_slots[0].unionall(ui.enemy_card_slots)
+
 
+def draw_table():
+    ui.draw_board()
     ui.draw_game(player, enemy)
 
-    center = pygame.Vector2(WIDTH / 2 - 350, 95 if not player_turn else 630)
-    end = pygame.Vector2(WIDTH / 2 - 300, 95 if not player_turn else 630)
+    center = pygame.Vector2(WIDTH / 2 - 350, 95 if not match.player_turn else 630)
+    end = pygame.Vector2(WIDTH / 2 - 300, 95 if not match.player_turn else 630)
     # draw_arrow(screen, center, end, pygame.Color("dodgerblue"), 10, 20, 12)
     draw_arrow(screen, center, end, pygame.Color(0, 0, 0), 10, 20, 12)
 
-    # --- Draw 5 card boxes at the bottom
-    box_width = 100
-    box_height = 145
-    spacing = 10
-    start_x = (WIDTH - (5 * box_width + 4 * spacing)) // 2
-    y_pos = HEIGHT - box_height - 20
-
-    last_cards = player.drawn_cards[-5:]
-    enemy_last_cards = enemy.drawn_cards[-5:]
-
-    for i in range(5):
-        card_slot_rect = pygame.Rect(start_x + i * (box_width + spacing), y_pos, box_width, box_height)
-        enemy_card_slot_rect = pygame.Rect(start_x + i * (box_width + spacing), 20, box_width, box_height)
-
-        # Draw empty box
-        pygame.draw.rect(screen, (200, 200, 200), card_slot_rect, border_radius=5)
-        pygame.draw.rect(screen, (200, 200, 200), enemy_card_slot_rect, border_radius=5)
-
-        # Decide border color
-        if i < len(last_cards) and last_cards[i] == player.selected_card and i == player.selected_card_position:
-            border_color = (255, 215, 0)  # highlight
-        else:
-            border_color = (0, 0, 0)
-        pygame.draw.rect(screen, border_color, card_slot_rect, 3, border_radius=5)
-
-        if i < len(enemy_last_cards) and enemy_last_cards[i] == enemy.selected_card:
-            border_color = (255, 215, 0)  # highlight
-        else:
-            border_color = (0, 0, 0)
-        pygame.draw.rect(screen, border_color, enemy_card_slot_rect, 3, border_radius=5)
-
-        # Draw card image if it exists
-        if i < len(last_cards):
-            card_key = card_name_to_filename(last_cards[i])
-            card_img = player.deck.images.get(card_key)
-            if card_img:
-                img_rect = card_img.get_rect(center=card_slot_rect.center)
-                screen.blit(card_img, img_rect)
-
-        if i < len(enemy_last_cards):
-            card_key = card_name_to_filename(enemy_last_cards[i])
-            card_img = enemy.deck.images.get(card_key)
-            if card_img:
-                img_rect = card_img.get_rect(center=enemy_card_slot_rect.center)
-                screen.blit(card_img, img_rect)
-
-        if played_card:
-            card_key = card_name_to_filename(played_card)
-            card_img = player.deck.images.get(card_key) if not player_turn else enemy.deck.images.get(card_key)
-            if card_img:
-                # Scale to fit nicely in the center
-                center_img = pygame.transform.scale(card_img, (200, 290))  # adjust size
-                center_rect = center_img.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-                screen.blit(center_img, center_rect)
+    played_deck = player.deck if not match.player_turn else enemy.deck
+    ui.draw_card_slots(player, enemy, played_card, played_deck, enemy_preview)
+    if hint is not None:
+        label = ui.render_text("Lethal", (255, 215, 0))
+        screen.blit(label, label.get_rect(midbottom=ui.card_slots[hint].midtop))
+    profiler.draw_graph(screen)
+
+
+hint = None  # hand index of the player's certain kill
+hint_key = None
+
+
+def update_hint():
+    """Look up the player's certain kill when the hand or the stats change"""
+    global hint, hint_key
+    if not show_hints or lethal_table is None or not match.player_turn:
+        hint = None
+        return
+    pos = search_ai.Position.from_match(match)
+    key = pos.key(0)
+    if key != hint_key:
+        hint_key = key
+        hint = lethal_table.lethal_play(pos)
+
+
+def table_elements():
+    """Regions of the board and the state each one is drawn from"""
+    elements = ui.game_elements(player, enemy)
+    elements["background"] = (screen.get_rect(), "table")
+    elements["enemy_arrow"] = (pygame.Rect(WIDTH // 2 - 355, 83, 60, 24), match.player_turn)
+    elements["player_arrow"] = (pygame.Rect(WIDTH // 2 - 355, 618, 60, 24), match.player_turn)
+    elements["hand"] = (hand_rect, (player.drawn_cards[:], player.selected_card, player.selected_card_position,
+                                    [player.deck.variants.get(card) for card in player.drawn_cards]))
+    elements["enemy_hand"] = (enemy_hand_rect, (enemy.drawn_cards[:], enemy.selected_card,
+                                                [enemy.deck.variants.get(card) for card in enemy.drawn_cards]))
+    center_deck = player.deck if not match.player_turn else enemy.deck
+    elements["played_card"] = (pygame.Rect(WIDTH // 2 - 100, HEIGHT // 2 - 145, 200, 290),
+                               (played_card, match.player_turn, center_deck.variants.get(played_card)))
+    elements["enemy_preview"] = (pygame.Rect(20, HEIGHT // 2 - 73, 100, 146),
+                                 (enemy_preview, enemy.deck.variants.get(enemy_preview)))
+    if show_hints:
+        elements["hint"] = (pygame.Rect(hand_rect.x, hand_rect.y - 30, hand_rect.width, 30), hint)
+    return elements
+
+
+def select_enemy_card(index):
+    enemy.selected_card = enemy.drawn_cards[index]
+    recorder.record(replay.SELECT, index)
+
+
+def request_enemy_move():
+    """Pick the enemy's card: right away at the random level or for a certain kill, on a worker for the search"""
+    if len(enemy.drawn_cards) == 0 or enemy.selected_card is not None:
+        return
+    if enemy_ai is None:
+        select_enemy_card(enemy.drawn_cards.index(streams.enemy_ai.choice(enemy.drawn_cards)))
+        return
+    kill = lethal_table.lethal_play(search_ai.Position.from_match(match)) if lethal_table is not None else None
+    if kill is not None:
+        select_enemy_card(kill)
+    else:
+        tasks.submit("enemy_move", enemy_ai.search, search_ai.Position.from_match(match), streams.enemy_ai,
+                     on_cancel=enemy_ai.stop)
+
+
+# -------------------------------
+# Main loop
+# -------------------------------
+running = True
+while running:
+    profiler.begin_frame()
+    update_hint()
+    scene.draw(scene.update(with_profiler_graph(table_elements())), draw_table)
+    enemy_preview = None
 
     ###
-    if player_turn:
+    if match.player_turn:
 
         # --- Handle events
-        for event in pygame.event.get():
+        events = frames.events()
+        profiler.mark("wait")
+        for event in events:
+            if profiler.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
 
+            elif event.type == TASK_DONE and tasks.collect(event):
+                if event.name == "lethal":
+                    lethal_table = event.result
+
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_e:
-                    player.deck.put_back('Jack of Spades')
+                    player.deck.put_back(parse_card('Jack of Spades'))
+                    recorder.record(replay.PUT_BACK, parse_card('Jack of Spades'))
 
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if ui.button_rect.collidepoint(event.pos):
                     # Draw a new card
-                    player.mana -= 1
-                    new_cards = player.deck.draw(1)
-                    player.drawn_cards.extend(new_cards)
-                    if len(player.drawn_cards) >= 6:
-                        player.drawn_cards = player.drawn_cards[1:]
+                    engine.apply_draw(match)
+                    recorder.record(replay.DRAW)
                     # Deselect if selected card is no longer in hand
                     if player.selected_card not in player.drawn_cards:
                         selected_card = None
@@ -186,67 +280,78 @@ while running:
 
                 elif ui.reverse_button_rect.collidepoint(event.pos):
                     # Reverse colors of selected card
-                    if player.selected_card:
-                        card_key = card_name_to_filename(player.selected_card)
-                        if card_key in player.deck.images:
-                            player.deck.invert_card_colors(card_key)
+                    if player.selected_card is not None:
+                        player.deck.invert_card_colors(player.selected_card)
+                        recorder.record(replay.REVERSE, player.selected_card)
 
                 elif ui.play_button_rect.collidepoint(event.pos):
                     # Play the selected card
                     played_card = player.selected_card
                     if player.selected_card in player.drawn_cards:
-                        player.calc_damage(played_card, enemy)
-                        player.drawn_cards.remove(player.selected_card)
+                        index = player.drawn_cards.index(player.selected_card)
+                        recorder.record(replay.PLAY, index)
+                        engine.apply_play(match, index)
                         player.selected_card = None  # deselect immediately
                         selected = None
 
                 else:
                     # Check if a card box was clicked
-                    selected, index = select_card(event.pos, player.drawn_cards[-5:], start_x, y_pos)
-                    if selected and selected in player.drawn_cards:
+                    selected, index = select_card(event.pos, player.drawn_cards, start_x, y_pos)
+                    if selected is not None and selected in player.drawn_cards:
                         player.selected_card = selected
                         player.selected_card_position = index
+                        recorder.record(replay.SELECT, index)
 
-            elif player.mana < 0:
-                player_turn = not player_turn
-                for i in range(10):
-                    enemy_card = enemy.deck.draw(1)
-                    enemy.drawn_cards.extend(enemy_card)
-                    if len(enemy.drawn_cards) >= 6:
-                        enemy.drawn_cards = enemy.drawn_cards[1:]
+            elif match.turn_over:
+                enemy_cards = engine.end_turn(match)
+                recorder.record(replay.END_TURN)
                 print(len(enemy.drawn_cards))
                 enemy_turn_step = 1
                 if enemy_turn_step:
-                    enemy_card = enemy_card[0] if len(enemy_card) > 0 else ""
+                    enemy_card = enemy_cards[-1] if len(enemy_cards) > 0 else None
                     enemy.enemy_card_start_time = pygame.time.get_ticks()
-                player.end_turn(enemy)
+                # apply_draw and apply_play now act for the enemy, so drop the rest of the batch
+                break
+        profiler.mark("player_turn")
 
     # Enemy turn
     else:
-        for event in pygame.event.get():
-            pass
+        # The enemy's steps are timed, so keep frames coming
+        events = frames.events(animating=True)
+        profiler.mark("wait")
+        for event in events:
+            if profiler.handle_event(event):
+                continue
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            elif event.type == TASK_DONE and tasks.collect(event):
+                if event.name == "enemy_move":
+                    select_enemy_card(event.result)
+                elif event.name == "lethal":
+                    lethal_table = event.result
+        profiler.mark("events")
+
+        step = enemy_turn_step
 
         if enemy_turn_step == 1:
             elapsed = pygame.time.get_ticks() - enemy.enemy_card_start_time
-            if elapsed <= enemy.ENEMY_DISPLAY_TIME and enemy_card != "":
-                card_key = card_name_to_filename(enemy_card)
-                card_img = enemy.deck.images.get(card_key)
-                if card_img:
-                    # Draw on the left side
-                    enemy_img = pygame.transform.scale(card_img, (100, 145))  # adjust size
-                    enemy_rect = enemy_img.get_rect(midleft=(20, HEIGHT // 2))
-                    screen.blit(enemy_img, enemy_rect)
+            if elapsed <= enemy.ENEMY_DISPLAY_TIME and enemy_card is not None:
+                enemy_preview = enemy_card
             else:
                 enemy_turn_step += 1
                 enemy.enemy_card_start_time = pygame.time.get_ticks()
 
         elif enemy_turn_step == 2:
             elapsed = pygame.time.get_ticks() - enemy.enemy_card_start_time
-            if elapsed <= enemy.ENEMY_DISPLAY_TIME:
-                if not enemy.selected_card:
-                    enemy.selected_card = random.choice(enemy.drawn_cards) if len(enemy.drawn_cards) > 0 else ""
-            else:
+            # Wait for a table still being built, so a seeded match plays the same with or without it
+            if not enemy_move_requested and not tasks.busy("lethal"):
+                enemy_move_requested = True
+                request_enemy_move()
+            # A search still running after the display time holds the step, the frames keep coming
+            if elapsed > enemy.ENEMY_DISPLAY_TIME and enemy_move_requested and not tasks.busy("enemy_move"):
                 enemy_turn_step = 3
+                enemy_move_requested = False
                 enemy.enemy_card_start_time = pygame.time.get_ticks()
 
         elif enemy_turn_step == 3:
@@ -254,43 +359,54 @@ while running:
             if elapsed <= enemy.ENEMY_DISPLAY_TIME:
                 if enemy.selected_card in enemy.drawn_cards:
                     played_card = enemy.selected_card
-                    enemy.calc_damage(played_card, player)
-                    enemy.drawn_cards.remove(enemy.selected_card)
+                    index = enemy.drawn_cards.index(enemy.selected_card)
+                    recorder.record(replay.PLAY, index)
+                    engine.apply_play(match, index)
                     enemy.selected_card = None  # deselect immediately
                     selected = None
             else:
                 enemy_turn_step = 4
 
         elif enemy_turn_step == 4:
-            if enemy.mana < 0:
+            if match.turn_over:
                 enemy_turn_step = 5
             elif len(enemy.drawn_cards) == 0:
-                    enemy.deck.draw(1)
-                    enemy.mana -= 1
+                engine.apply_draw(match)
+                recorder.record(replay.DRAW)
             else:
                 enemy_turn_step = 1
+        profiler.mark(f"enemy_step_{step}")
 
         if enemy_turn_step == 5:
-            new_cards = player.deck.draw(1)
-            player.drawn_cards.extend(new_cards)
-            if len(player.drawn_cards) >= 6:
-                player.drawn_cards = player.drawn_cards[1:]
-            player_turn = not player_turn
-            enemy.end_turn(player)
-
-    if enemy.life <= 0 or player.life <= 0:
+            engine.end_turn(match)
+            recorder.record(replay.END_TURN)
+            profiler.mark("enemy_step_5")
+
+    if match.finished:
         break
-    pygame.display.flip()
-    ui.clock.tick(60)
+tasks.cancel_all()
+recorder.close()
+
+player_won = match.winner == "player"
+
+
+def draw_end():
+    ui.draw_end_screen(player_won)
+    profiler.draw_graph(screen)
+
 
 while True:
-    ui.draw_end_screen(enemy.life < player.life)
-    for event in pygame.event.get():
+    profiler.begin_frame()
+    scene.draw(scene.update(with_profiler_graph({"end_screen": (screen.get_rect(), player_won)})), draw_end)
+
+    events = frames.events()
+    profiler.mark("wait")
+    for event in events:
+        if profiler.handle_event(event):
+            continue
         if event.type == pygame.QUIT:
             pygame.quit()
             sys.exit()
         elif event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
             pygame.quit()
             sys.exit()
-
-    pygame.display.flip()
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""Lethal check: can the side to move kill its opponent this turn?
+
+Usage:
+    python lethal.py           # build the table for the current card rules
+
+game.spec builds the table when packaging and ships it.  Running from
+source, game.py builds a missing table with ``build_table`` on a TaskRunner
+worker (a couple of seconds) and saves it for the next start.
+
+The table answers one question, the chance of killing the opponent this
+turn once the hand is empty; it holds no win probabilities beyond this turn.
+Checking a hand (``lethal_play``) searches its at most five cards with one
+table lookup at each leaf.
+
+A side can only win at the end of its own turn, when resolve_turn ticks
+the opponent's poison and applies its damage.  The game is decided once the
+side to move can force that: it kills iff
+
+    R - max(0, D - S) <= 0
+
+with R the opponent's life minus poison, S the opponent's shield and D the
+side's damage (its own shield Sh feeds D through shield_damage).
+
+The solver fills ``V[M, R, S, D, Sh]``: the probability of killing this turn
+once the side's hand is empty and it keeps paying 1 mana to draw and
+playing what it draws (the enemy's loop in game.py), with draws uniform
+over the 52 cards of the rules.  Every draw costs mana, so the table is
+filled from low mana up in one pass per mana level, vectorized over the
+other four axes.  Probabilities are stored as uint8 (255 = certain) in an
+.npy file named after a hash of the card rules, loaded with ``mmap_mode``,
+so the game touches only the pages it looks up.
+
+The hand itself is too large to tabulate (C(52, 5) hands times the stats),
+so ``kill_chance`` plays out the at most 5! orders of the real hand with
+search_ai's moves and looks up the table once the hand is empty.  When the
+kill is certain the line is provably optimal: nothing beats winning now.
+States outside the table (R above R_MAX, S above S_MAX, mana above M_MAX)
+count as no kill.
+"""
+import hashlib
+import os
+import time
+
+import numpy as np
+
+import engine
+import rules
+from paths import get_asset_path
+from search_ai import end_turn, play
+
+R_MAX = 24  # opponent life minus poison
+S_MAX = 8  # opponent shield
+N_MAX = R_MAX + S_MAX  # damage and own shield beyond this kill anything in the table
+M_MAX = 14  # mana
+
+
+# -------------------------------
+# Solver
+# -------------------------------
+def rules_key(card_rules):
+    """Short hash of everything the table depends on"""
+    digest = hashlib.sha1()
+    for array in (np.array(card_rules.costs, dtype=np.int32), card_rules.ops, card_rules.amounts,
+                  np.array([R_MAX, S_MAX, M_MAX], dtype=np.int32)):
+        digest.update(array.tobytes())
+    return digest.hexdigest()[:12]
+
+
+def table_name(card_rules=None):
+    return f"lethal_{rules_key(card_rules or engine.CARD_RULES)}.npy"
+
+
+def table_path(card_rules=None):
+    return get_asset_path(table_name(card_rules))
+
+
+def kills(r, s, d):
+    return r - np.maximum(0, d - s) <= 0
+
+
+def apply_card(card_rules, card, r, s, d, sh):
+    """The card's effects on the (R, S, D, Sh) grids, in rules order"""
+    for op, amount in zip(card_rules.ops[card], card_rules.amounts[card]):
+        if op == rules.DAMAGE:
+            d = np.full_like(d, min(amount, N_MAX))
+        elif op == rules.SHIELD:
+            sh = np.minimum(N_MAX, sh + amount)
+        elif op == rules.STRIP_SHIELD:
+            s = np.maximum(0, s - amount)
+        elif op == rules.SHIELD_DAMAGE:
+            d = sh
+        elif op == rules.POISON:
+            r = np.maximum(0, r - amount)
+        # cure and heal only touch the side's own poison and life
+    return r, s, d, sh
+
+
+def solve(card_rules):
+    """V[M, R, S, D, Sh] as floats"""
+    costs = card_rules.costs
+    if min(costs) < 0:
+        raise ValueError("the lethal table needs cards that cost mana, not give it")
+    r, s, d, sh = np.meshgrid(np.arange(R_MAX + 1), np.arange(S_MAX + 1), np.arange(N_MAX + 1),
+                              np.arange(N_MAX + 1), indexing="ij")
+    table = np.zeros((M_MAX + 1,) + r.shape)
+    killed_now = kills(r, s, d)
+    for mana in range(M_MAX + 1):
+        if mana == 0:
+            # The draw alone ends the turn
+            table[0] = killed_now
+            continue
+        total = np.zeros(r.shape)
+        for card in range(len(costs)):
+            left = mana - 1 - costs[card]
+            r2, s2, d2, sh2 = apply_card(card_rules, card, r, s, d, sh)
+            if left < 0:
+                total += kills(r2, s2, d2)
+            else:
+                total += table[left][r2, s2, d2, sh2]
+        table[mana] = total / len(costs)
+    return table
+
+
+def quantize(table):
+    """uint8 probabilities; only exact certainties become 255"""
+    return np.where(table >= 1, 255, np.minimum(254, np.floor(table * 255))).astype(np.uint8)
+
+
+def build(card_rules=None, path=None):
+    card_rules = card_rules or engine.CARD_RULES
+    path = path or table_path(card_rules)
+    np.save(path, quantize(solve(card_rules)))
+    return path
+
+
+def load_table(card_rules=None):
+    """The shipped table for the current rules, memory-mapped, or None if it is missing"""
+    path = table_path(card_rules)
+    if not os.path.exists(path):
+        return None
+    return LethalTable(np.load(path, mmap_mode="r"))
+
+
+def build_table(card_rules=None):
+    """Solve a missing table (slow, for a worker thread) and save it for the next start"""
+    values = quantize(solve(card_rules or engine.CARD_RULES))
+    try:
+        np.save(table_path(card_rules), values)
+    except OSError as error:
+        print('Lethal table not saved:', error)
+    return LethalTable(values)
+
+
+# -------------------------------
+# Lookups
+# -------------------------------
+class LethalTable:
+    def __init__(self, values):
+        self.values = values  # uint8 [M, R, S, D, Sh], 255 = certain kill
+
+    def empty_hand(self, mana, mine, theirs):
+        """Kill chance (0-255) once the hand is empty, None outside the table"""
+        r = theirs.life - theirs.poison
+        if r <= 0:
+            return 255
+        if r > R_MAX or theirs.shield > S_MAX or mana > M_MAX:
+            return None
+        return int(self.values[mana, r, theirs.shield, min(mine.damage_value, N_MAX), min(mine.shield, N_MAX)])
+
+    def kill_chance(self, pos):
+        """Best kill chance (0-255) this turn for the side to move in a search_ai Position"""
+        mine, theirs = pos.stats
+        if mine.mana < 0:
+            return 255 if end_turn(pos).stats[1].life <= 0 else 0
+        hand = pos.hands[0]
+        if hand:
+            return max(self.kill_chance(play(pos, hand.index(card))) for card in set(hand))
+        left = len(pos.decks[0])
+        if not left:
+            # Draws from an empty deck only burn mana
+            return 255 if kills(theirs.life - theirs.poison, theirs.shield, mine.damage_value) else 0
+        if left <= mine.mana:
+            # The deck may run dry mid-turn, which the table does not model
+            return 0
+        # A kill for every card sequence is also one for any real deck
+        return self.empty_hand(mine.mana, mine, theirs) or 0
+
+    def lethal_play(self, pos):
+        """Hand index that kills this turn for certain for the side to move, or None"""
+        for card in sorted(set(pos.hands[0])):
+            index = pos.hands[0].index(card)
+            if self.kill_chance(play(pos, index)) == 255:
+                return index
+        return None
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    path = build()
+    values = np.load(path, mmap_mode="r")
+    print(f"{path}: {values.shape}, {values.nbytes / 1e6:.1f} MB, "
+          f"{100 * (values == 255).mean():.1f}% certain kills, {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,31 @@
+"""Frame pacing for the game loops.
+
+While something is animating the loop runs at the target frame rate.
+Otherwise it sleeps in ``pygame.event.wait`` until input arrives or
+``idle_timeout`` ms pass, so an idle window uses next to no CPU.
+"""
+import os
+
+import pygame
+
+DEFAULT_FPS = int(os.environ.get("CARD_GAME_FPS", 60))
+
+
+class FrameScheduler:
+    def __init__(self, clock, fps=DEFAULT_FPS, idle_timeout=1000):
+        self.clock = clock
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+
+    def events(self, animating=False):
+        """Wait for the next frame and return its events"""
+        # Caps the frame rate; returns at once after an idle wait
+        self.clock.tick(self.fps)
+        if animating:
+            return pygame.event.get()
+
+        event = pygame.event.wait(self.idle_timeout)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        if pygame.event.peek():
+            events.extend(pygame.event.get())
+        return events
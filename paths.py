@@ -0,0 +1,17 @@
+"""Locating bundled data files, without pygame so headless modules can use it."""
+import os
+import sys
+
+# The source tree, so tools find their data from any working directory
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def get_asset_path(relative_path):
+    """ Get the absolute path to an asset, works for dev and for PyInstaller bundled exe """
+    if hasattr(sys, '_MEIPASS'):
+        # Running as a bundled executable
+        base_path = sys._MEIPASS
+    else:
+        # Running in normal Python environment
+        base_path = SOURCE_DIR
+    return os.path.join(base_path, relative_path)
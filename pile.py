@@ -0,0 +1,166 @@
+"""Card containers for decks and hands.
+
+``CardPile`` stores a deck in a preallocated array with a read cursor, so
+drawing k cards costs O(k) instead of re-slicing the whole deck.  ``Hand``
+is a fixed-capacity ring buffer matching the 5-slot hand display.
+"""
+import random
+from array import array
+
+
+class CardPile:
+    """Deck storage: cards[top:end] of a flat array, index 0 is the next card drawn."""
+
+    def __init__(self, cards=()):
+        self.reset(cards)
+
+    def reset(self, cards):
+        self._cards = array('h', cards)
+        self._top = 0
+        self._end = len(self._cards)
+
+    def __len__(self):
+        return self._end - self._top
+
+    def __iter__(self):
+        return iter(self._cards[self._top:self._end])
+
+    def __contains__(self, card):
+        return self.index(card) is not None
+
+    def _position(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("CardPile index out of range")
+        return self._top + i
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self._cards[self._top:self._end][i].tolist()
+        return self._cards[self._position(i)]
+
+    def __setitem__(self, i, card):
+        self._cards[self._position(i)] = card
+
+    def index(self, card):
+        """Position of ``card`` from the top, or None"""
+        for i in range(self._top, self._end):
+            if self._cards[i] == card:
+                return i - self._top
+        return None
+
+    def peek(self, n=1):
+        if n > len(self):
+            return []
+        return self._cards[self._top:self._top + n].tolist()
+
+    def draw(self, n=1):
+        drawn = self.peek(n)
+        self._top += len(drawn)
+        return drawn
+
+    def put_back(self, card):
+        """Put a card at the bottom"""
+        if self._end == len(self._cards):
+            # Reclaim the drawn prefix before growing the array
+            if self._top >= len(self) and self._top > 0:
+                del self._cards[:self._top]
+                self._end -= self._top
+                self._top = 0
+            self._cards.append(card)
+        else:
+            self._cards[self._end] = card
+        self._end += 1
+
+    def shuffle(self, rng=random):
+        """Shuffle the undrawn cards in place"""
+        with memoryview(self._cards) as view:
+            rng.shuffle(view[self._top:self._end])
+
+    def tolist(self):
+        return self._cards[self._top:self._end].tolist()
+
+
+class Hand:
+    """Fixed-capacity ring buffer of cards, oldest first.
+
+    Appending to a full hand drops the oldest card.
+    """
+
+    def __init__(self, capacity, cards=()):
+        self._slots = [None] * capacity
+        self._start = 0
+        self._len = 0
+        for card in cards:
+            self.append(card)
+
+    @property
+    def capacity(self):
+        return len(self._slots)
+
+    def __len__(self):
+        return self._len
+
+    def _slot(self, i):
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("Hand index out of range")
+        return (self._start + i) % len(self._slots)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._len))]
+        return self._slots[self._slot(i)]
+
+    def __iter__(self):
+        for i in range(self._len):
+            yield self._slots[(self._start + i) % len(self._slots)]
+
+    def __contains__(self, card):
+        return self.index(card) is not None
+
+    def index(self, card):
+        for i, held in enumerate(self):
+            if held == card:
+                return i
+        return None
+
+    def append(self, card):
+        """Add a card; returns the card dropped from a full hand, if any"""
+        dropped = None
+        capacity = len(self._slots)
+        if self._len == capacity:
+            dropped = self._slots[self._start]
+            self._start = (self._start + 1) % capacity
+            self._len -= 1
+        self._slots[(self._start + self._len) % capacity] = card
+        self._len += 1
+        return dropped
+
+    def pop(self, i=-1):
+        card = self._slots[self._slot(i)]
+        if i < 0:
+            i += self._len
+        capacity = len(self._slots)
+        # Close the gap by moving the newer cards back one slot
+        for j in range(i, self._len - 1):
+            self._slots[(self._start + j) % capacity] = self._slots[(self._start + j + 1) % capacity]
+        self._len -= 1
+        self._slots[(self._start + self._len) % capacity] = None
+        return card
+
+    def remove(self, card):
+        i = self.index(card)
+        if i is None:
+            raise ValueError("card not in hand")
+        self.pop(i)
+
+    def clear(self):
+        self._slots = [None] * len(self._slots)
+        self._start = 0
+        self._len = 0
+
+    def copy(self):
+        return Hand(len(self._slots), self)
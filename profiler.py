@@ -0,0 +1,168 @@
+"""Per-phase frame timings for the game loops.
+
+The loops call ``begin_frame()`` once per iteration and ``mark(phase)``
+after each piece of work; the time since the previous mark is booked to
+that phase.  The last ``capacity`` frames are kept in a ring buffer, can be
+shown as a stacked frame-time graph and dumped to CSV or Chrome trace JSON
+(open in chrome://tracing or Perfetto).
+
+Hotkeys (see ``handle_event``): F3 toggles recording and the graph, F4
+writes a CSV, F5 writes a Chrome trace.  While disabled ``mark`` returns
+after one attribute check.  Set CARD_GAME_PROFILE=1 to start enabled.
+"""
+import csv
+import json
+import os
+import time
+
+import numpy as np
+import pygame
+
+PHASES = ("wait", "events", "player_turn",
+          "enemy_step_1", "enemy_step_2", "enemy_step_3", "enemy_step_4", "enemy_step_5",
+          "draw", "present")
+
+PHASE_COLORS = {
+    "wait": (90, 90, 90),
+    "events": (0, 160, 255),
+    "player_turn": (0, 200, 120),
+    "enemy_step_1": (255, 140, 0),
+    "enemy_step_2": (255, 180, 0),
+    "enemy_step_3": (255, 80, 80),
+    "enemy_step_4": (200, 60, 160),
+    "enemy_step_5": (150, 60, 220),
+    "draw": (255, 255, 255),
+    "present": (255, 255, 120),
+}
+
+FRAME_BUDGET_MS = 1000 / 60
+
+
+class FrameProfiler:
+    def __init__(self, capacity=600, enabled=None):
+        if enabled is None:
+            enabled = os.environ.get("CARD_GAME_PROFILE") == "1"
+        self.enabled = enabled
+        self.show_graph = enabled
+        self.capacity = capacity
+        self._phase_index = {name: i for i, name in enumerate(PHASES)}
+
+        # Ring buffer rows: one per frame, durations and start offsets in ms
+        self.durations = np.zeros((capacity, len(PHASES)))
+        self.starts = np.zeros((capacity, len(PHASES)))
+        self.frame_starts = np.zeros(capacity)
+        self.frames = 0  # frames recorded so far
+        self._row = -1
+        self._origin = time.perf_counter()
+        self._last = self._origin
+        self._font = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._row = self.frames % self.capacity
+        self.frames += 1
+        self.durations[self._row] = 0
+        self.starts[self._row] = 0
+        self.frame_starts[self._row] = (now - self._origin) * 1000
+        self._last = now
+
+    def mark(self, phase):
+        """Book the time since the last mark to ``phase``"""
+        if not self.enabled or self._row < 0:
+            return
+        now = time.perf_counter()
+        i = self._phase_index[phase]
+        if self.durations[self._row, i] == 0:
+            self.starts[self._row, i] = (self._last - self._origin) * 1000
+        self.durations[self._row, i] += (now - self._last) * 1000
+        self._last = now
+
+    def recent(self, n=None):
+        """Row indices of the last ``n`` recorded frames, oldest first"""
+        count = min(self.frames, self.capacity)
+        if n is not None:
+            count = min(count, n)
+        return [(self.frames - count + k) % self.capacity for k in range(count)]
+
+    # -------------------------------
+    # Hotkeys and HUD
+    # -------------------------------
+    def handle_event(self, event):
+        """Handle the profiler hotkeys; returns True when the event was used"""
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == pygame.K_F3:
+            self.enabled = self.show_graph = not self.enabled
+            self._row = -1
+        elif event.key == pygame.K_F4:
+            print('Profile written to', self.dump_csv())
+        elif event.key == pygame.K_F5:
+            print('Trace written to', self.dump_chrome_trace())
+        else:
+            return False
+        return True
+
+    def graph_rect(self, surface):
+        return pygame.Rect(surface.get_width() - 320, 45, 300, 110)
+
+    def draw_graph(self, surface, frames=150):
+        """Stacked per-phase frame times of the last ``frames`` frames"""
+        if not self.show_graph:
+            return
+        rect = self.graph_rect(surface)
+        plot = pygame.Rect(rect.x, rect.y, rect.width, rect.height - 14)
+        pygame.draw.rect(surface, (20, 20, 20), rect)
+
+        ms_per_px = 2 * FRAME_BUDGET_MS / plot.height
+        bar_width = max(1, plot.width // frames)
+        for k, row in enumerate(self.recent(plot.width // bar_width)):
+            x = plot.x + k * bar_width
+            y = plot.bottom
+            for i, name in enumerate(PHASES):
+                height = int(self.durations[row, i] / ms_per_px)
+                if height and y > plot.y:
+                    top = max(plot.y, y - height)
+                    pygame.draw.rect(surface, PHASE_COLORS[name], (x, top, bar_width, y - top))
+                    y = top
+        # 16.7 ms budget line
+        budget_y = plot.bottom - int(FRAME_BUDGET_MS / ms_per_px)
+        pygame.draw.line(surface, (255, 0, 0), (plot.x, budget_y), (plot.right, budget_y))
+
+        if self._font is None:
+            self._font = pygame.font.SysFont(None, 16)
+        x = rect.x + 2
+        for name in PHASES:
+            label = self._font.render(name.replace("enemy_step_", "e"), True, PHASE_COLORS[name])
+            surface.blit(label, (x, rect.bottom - 12))
+            x += label.get_width() + 6
+
+    # -------------------------------
+    # Export
+    # -------------------------------
+    def dump_csv(self, path=None):
+        path = path or time.strftime("frame_profile_%Y%m%d_%H%M%S.csv")
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(("frame_start_ms", "total_ms") + PHASES)
+            for row in self.recent():
+                durations = self.durations[row]
+                writer.writerow([f"{self.frame_starts[row]:.3f}", f"{durations.sum():.3f}"]
+                                + [f"{d:.3f}" for d in durations])
+        return path
+
+    def dump_chrome_trace(self, path=None):
+        path = path or time.strftime("frame_profile_%Y%m%d_%H%M%S.json")
+        events = []
+        for row in self.recent():
+            frame_ms = self.durations[row].sum()
+            events.append({"name": "frame", "ph": "X", "pid": 1, "tid": 1,
+                           "ts": self.frame_starts[row] * 1000, "dur": frame_ms * 1000})
+            for i, name in enumerate(PHASES):
+                if self.durations[row, i]:
+                    events.append({"name": name, "ph": "X", "pid": 1, "tid": 1,
+                                   "ts": self.starts[row, i] * 1000, "dur": self.durations[row, i] * 1000})
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        return path
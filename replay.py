@@ -0,0 +1,267 @@
+"""Compact match recordings and headless replay.
+
+Usage:
+    python replay.py recordings/*.cgr          # summary of each match
+    python replay.py --turn 12 match.cgr       # state at the start of turn 12
+
+A recording is a small header followed by one 2-byte record per action:
+
+    header   b"CGR1", seed length (u8), seed (little endian),
+             player hand, player deck, enemy hand, enemy deck
+             (each a u16 count and one byte per card),
+             player and enemy starting mana (i8 each)
+    action   opcode (u8), argument (u8: hand slot or card)
+
+Enemy choices are recorded as the actions they led to, so replaying needs
+no RNG.  ``MatchRecorder`` appends to the file as the game runs and flushes
+at every turn end; a torn last record is ignored when reading.
+
+``Replay`` re-applies the actions with engine.py, without pygame, and keeps
+a snapshot every ``snapshot_every`` actions so seeking doesn't restart from
+the first action.
+"""
+import argparse
+import struct
+import sys
+import time
+
+import engine
+from pile import Hand
+
+MAGIC = b"CGR1"
+
+# Opcodes
+DRAW, SELECT, PLAY, REVERSE, END_TURN, PUT_BACK = range(1, 7)
+OPCODE_NAMES = {DRAW: "draw", SELECT: "select", PLAY: "play", REVERSE: "reverse",
+                END_TURN: "end_turn", PUT_BACK: "put_back"}
+
+
+# -------------------------------
+# Recording
+# -------------------------------
+def encode_header(seed, player, enemy):
+    """Header bytes for a match about to start between two Character/Side objects"""
+    seed_bytes = seed.to_bytes((seed.bit_length() + 7) // 8 or 1, "little")
+    parts = [MAGIC, struct.pack("<B", len(seed_bytes)), seed_bytes]
+    for side in (player, enemy):
+        for cards in (list(side.drawn_cards), side.deck.tolist()):
+            parts.append(struct.pack("<H", len(cards)))
+            parts.append(bytes(cards))
+    parts.append(struct.pack("<bb", player.mana, enemy.mana))
+    return b"".join(parts)
+
+
+class MatchRecorder:
+    """Appends one match's actions to a recording file (nothing when ``path`` is None)"""
+
+    def __init__(self, path, seed, player, enemy):
+        self.path = path
+        self.file = None
+        if path is not None:
+            self.file = open(path, 'ab')
+            self.file.write(encode_header(seed, player, enemy))
+            self.file.flush()
+
+    def record(self, opcode, arg=0):
+        if self.file is None:
+            return
+        self.file.write(bytes((opcode, arg)))
+        if opcode == END_TURN:
+            self.file.flush()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+# -------------------------------
+# Reading
+# -------------------------------
+def decode(data):
+    """(seed, [player hand, player deck, enemy hand, enemy deck], (player mana, enemy mana), actions)"""
+    if data[:4] != MAGIC:
+        raise ValueError("not a match recording")
+    pos = 4
+    seed_len = data[pos]
+    pos += 1
+    seed = int.from_bytes(data[pos:pos + seed_len], "little")
+    pos += seed_len
+
+    piles = []
+    for _ in range(4):
+        (count,) = struct.unpack_from("<H", data, pos)
+        pos += 2
+        piles.append(list(data[pos:pos + count]))
+        pos += count
+    mana = struct.unpack_from("<bb", data, pos)
+    pos += 2
+
+    actions = data[pos:pos + (len(data) - pos) // 2 * 2]
+    return seed, piles, mana, actions
+
+
+def read_recording(path):
+    with open(path, 'rb') as file:
+        return decode(file.read())
+
+
+# -------------------------------
+# Replay
+# -------------------------------
+class ReplayState(engine.MatchState):
+    """MatchState plus the UI-only state a recording carries"""
+
+    def __init__(self, player, enemy, seed=None):
+        super().__init__(player, enemy, seed)
+        self.selected = {"player": None, "enemy": None}  # hand slot
+        self.variants = {"player": {}, "enemy": {}}  # card -> inverted
+
+    def side_name(self):
+        return "player" if self.player_turn else "enemy"
+
+
+def new_replay_state(seed, piles, mana):
+    player_hand, player_deck, enemy_hand, enemy_deck = piles
+    player = engine.Side(player_deck, mana[0])
+    enemy = engine.Side(enemy_deck, mana[1])
+    player.drawn_cards = Hand(engine.HAND_SIZE, player_hand)
+    enemy.drawn_cards = Hand(engine.HAND_SIZE, enemy_hand)
+    return ReplayState(player, enemy, seed)
+
+
+def apply_action(state, opcode, arg):
+    side = state.side_name()
+    if opcode == DRAW:
+        engine.apply_draw(state)
+    elif opcode == SELECT:
+        state.selected[side] = arg
+    elif opcode == PLAY:
+        engine.apply_play(state, arg)
+        state.selected[side] = None
+    elif opcode == REVERSE:
+        variants = state.variants[side]
+        variants[arg] = not variants.get(arg, False)
+    elif opcode == END_TURN:
+        engine.end_turn(state)
+    elif opcode == PUT_BACK:
+        state.player.deck.put_back(arg)
+    else:
+        raise ValueError(f"unknown opcode {opcode}")
+
+
+def snapshot(state):
+    sides = []
+    for side in (state.player, state.enemy):
+        sides.append((side.deck.tolist(), list(side.drawn_cards), side.life, side.poison,
+                      side.shield, side.damage_value, side.mana))
+    return (state.player_turn, state.turns, tuple(sides),
+            dict(state.selected), {name: dict(v) for name, v in state.variants.items()})
+
+
+def restore(snap, seed):
+    player_turn, turns, sides, selected, variants = snap
+    restored = []
+    for deck, hand, life, poison, shield, damage_value, mana in sides:
+        side = engine.Side(deck, mana)
+        side.drawn_cards = Hand(engine.HAND_SIZE, hand)
+        side.life, side.poison, side.shield, side.damage_value = life, poison, shield, damage_value
+        restored.append(side)
+    state = ReplayState(restored[0], restored[1], seed)
+    state.player_turn = player_turn
+    state.turns = turns
+    state.selected = dict(selected)
+    state.variants = {name: dict(v) for name, v in variants.items()}
+    return state
+
+
+class Replay:
+    def __init__(self, data, snapshot_every=64):
+        self.seed, self.piles, self.mana, self.actions = decode(data)
+        self.snapshot_every = snapshot_every
+        self._snapshots = None  # action index -> snapshot, filled by the first full pass
+        self.turn_starts = None  # turn -> index of its first action
+
+    @classmethod
+    def from_file(cls, path, snapshot_every=64):
+        with open(path, 'rb') as file:
+            return cls(file.read(), snapshot_every)
+
+    def __len__(self):
+        return len(self.actions) // 2
+
+    def initial_state(self):
+        return new_replay_state(self.seed, self.piles, self.mana)
+
+    def actions_list(self):
+        """[(opcode name, argument)] for inspection"""
+        return [(OPCODE_NAMES[self.actions[i]], self.actions[i + 1]) for i in range(0, len(self.actions), 2)]
+
+    def run(self):
+        """Apply every action; returns the final state"""
+        state = self.initial_state()
+        actions = self.actions
+        for i in range(0, len(actions), 2):
+            apply_action(state, actions[i], actions[i + 1])
+        return state
+
+    def _index(self):
+        state = self.initial_state()
+        self._snapshots = {0: snapshot(state)}
+        self.turn_starts = {0: 0}
+        actions = self.actions
+        for n in range(len(self)):
+            apply_action(state, actions[2 * n], actions[2 * n + 1])
+            if state.turns not in self.turn_starts:
+                self.turn_starts[state.turns] = n + 1
+            if (n + 1) % self.snapshot_every == 0:
+                self._snapshots[n + 1] = snapshot(state)
+
+    def state_at(self, n):
+        """State after the first ``n`` actions"""
+        if self._snapshots is None:
+            self._index()
+        n = max(0, min(n, len(self)))
+        start = n - n % self.snapshot_every
+        state = restore(self._snapshots[start], self.seed)
+        for i in range(start, n):
+            apply_action(state, self.actions[2 * i], self.actions[2 * i + 1])
+        return state
+
+    def state_at_turn(self, turn):
+        """State at the start of ``turn`` (0 is the opening deal)"""
+        if self.turn_starts is None:
+            self._index()
+        if turn not in self.turn_starts:
+            raise ValueError(f"the recording ends before turn {turn}")
+        return self.state_at(self.turn_starts[turn])
+
+
+def describe(state):
+    lines = [f"turn {state.turns}, {'player' if state.player_turn else 'enemy'} to act"]
+    for name, side in (("player", state.player), ("enemy", state.enemy)):
+        lines.append(f"  {name:<6} life {side.life:>4} poison {side.poison:>3} shield {side.shield:>3} "
+                     f"mana {side.mana:>3} hand {list(side.drawn_cards)} deck {len(side.deck)}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recordings", nargs="+")
+    parser.add_argument("--turn", type=int, help="show the state at the start of this turn")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    for path in args.recordings:
+        replay = Replay.from_file(path)
+        if args.turn is not None:
+            state = replay.state_at_turn(args.turn)
+        else:
+            state = replay.run()
+        print(f"{path}: seed {replay.seed}, {len(replay)} actions, winner {state.winner}")
+        print(describe(state))
+    elapsed = time.perf_counter() - start
+    print(f"{len(args.recordings)} matches in {elapsed:.3f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
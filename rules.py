@@ -0,0 +1,236 @@
+"""Card rules read from a data file and compiled into per-card effect tables.
+
+``card_rules.json`` (or the file named by CARD_GAME_RULES) holds a list of
+rules; each one selects cards and gives their mana cost and effects:
+
+    {"suit": "Diamonds", "parity": "even", "cost": "value",
+     "effects": [["strip_shield", "value"], ["shield_damage"]]}
+
+Selectors (all optional, combined with "and"): ``suit`` a suit name,
+``parity`` "odd" or "even" on the card's value (2..14), ``ranks`` a list of
+rank names, ``card`` a single "Rank of Suit".  Later rules replace earlier
+ones for the cards they select, so a balance tweak to one card is one extra
+line.  ``cost`` defaults to "value".  Amounts are ints or ``a*value+b``
+expressions ("value", "2*value", "value-1").
+
+Effects, applied in order by the side that plays the card:
+
+    damage n         own damage this turn becomes n
+    shield n         own shield += n
+    strip_shield n   enemy shield -= n (not below 0)
+    shield_damage    own damage this turn becomes own shield
+    poison n         enemy poison += n
+    cure n           own poison -= n (not below 0)
+    heal n           own life += n
+
+``compile_rules`` resolves every amount for every card once.  For engine.py
+each card becomes one function with its cost and amounts baked in, so a
+play is a list lookup and a call (``CardRules.plays[card](side, enemy)``),
+no slower than the old if/elif chain on suit.  batch_sim.py gets the same
+rules as opcode and amount arrays (``costs``, ``ops``, ``amounts``).
+"""
+import json
+import os
+import re
+
+import numpy as np
+
+from cards import CARD_NAMES, CARD_RANKS, CARD_SUITS, CARD_VALUES, DECK_SIZE, RANKS, SUITS, parse_card
+from paths import get_asset_path
+
+RULES_PATH = os.environ.get("CARD_GAME_RULES") or get_asset_path("card_rules.json")
+
+
+# -------------------------------
+# Effects
+# -------------------------------
+# Each factory bakes a card's cost and amount into one function of (side, enemy),
+# so a card with a single effect plays with one call; later effects of a card get cost 0.
+def damage(cost, amount):
+    def play(side, enemy):
+        side.mana -= cost
+        side.damage_value = amount
+    return play
+
+
+def shield(cost, amount):
+    def play(side, enemy):
+        side.mana -= cost
+        side.shield += amount
+    return play
+
+
+def strip_shield(cost, amount):
+    def play(side, enemy):
+        side.mana -= cost
+        enemy.shield = max(0, enemy.shield - amount)
+    return play
+
+
+def shield_damage(cost, amount):
+    def play(side, enemy):
+        side.mana -= cost
+        side.damage_value = side.shield
+    return play
+
+
+def poison(cost, amount):
+    def play(side, enemy):
+        side.mana -= cost
+        enemy.poison += amount
+    return play
+
+
+def cure(cost, amount):
+    def play(side, enemy):
+        side.mana -= cost
+        side.poison = max(0, side.poison - amount)
+    return play
+
+
+def heal(cost, amount):
+    def play(side, enemy):
+        side.mana -= cost
+        side.life += amount
+    return play
+
+
+def pay(cost):
+    """A card without effects"""
+    def play(side, enemy):
+        side.mana -= cost
+    return play
+
+
+def sequence(steps):
+    if len(steps) == 2:
+        first, second = steps
+
+        def play(side, enemy):
+            first(side, enemy)
+            second(side, enemy)
+    else:
+        def play(side, enemy):
+            for step in steps:
+                step(side, enemy)
+    return play
+
+
+# Opcode = index + 1; 0 marks an unused effect slot in the arrays
+EFFECTS = (damage, shield, strip_shield, shield_damage, poison, cure, heal)
+OPCODES = {fn.__name__: code for code, fn in enumerate(EFFECTS, 1)}
+NO_EFFECT = 0
+DAMAGE, SHIELD, STRIP_SHIELD, SHIELD_DAMAGE, POISON, CURE, HEAL = range(1, len(EFFECTS) + 1)
+
+
+def compile_card(cost, effects):
+    """One play(side, enemy) function for a card's cost and (name, amount) effects"""
+    if not effects:
+        return pay(cost)
+    steps = [EFFECTS[OPCODES[name] - 1](cost if i == 0 else 0, amount) for i, (name, amount) in enumerate(effects)]
+    return steps[0] if len(steps) == 1 else sequence(steps)
+
+
+# -------------------------------
+# Compiling
+# -------------------------------
+_AMOUNT = re.compile(r"^(?:(\d+)\s*\*\s*)?value\s*(?:([+-])\s*(\d+))?$")
+
+
+def parse_amount(amount, value):
+    """An int, or 'a*value+b' evaluated for a card of ``value``"""
+    if isinstance(amount, int):
+        return amount
+    text = str(amount).strip()
+    if re.fullmatch(r"-?\d+", text):
+        return int(text)
+    match = _AMOUNT.match(text)
+    if match is None:
+        raise ValueError(f"Bad amount '{amount}', expected an int or e.g. '2*value+1'")
+    scale, sign, offset = match.groups()
+    result = int(scale or 1) * value
+    if offset:
+        result += int(offset) if sign == "+" else -int(offset)
+    return result
+
+
+def selected_cards(rule):
+    """Cards matched by a rule's selectors"""
+    selected = range(DECK_SIZE)
+    if "card" in rule:
+        selected = [parse_card(rule["card"])]
+    if "suit" in rule:
+        if rule["suit"] not in SUITS:
+            raise ValueError(f"Unknown suit '{rule['suit']}'")
+        suit = SUITS.index(rule["suit"])
+        selected = [card for card in selected if CARD_SUITS[card] == suit]
+    if "parity" in rule:
+        if rule["parity"] not in ("odd", "even"):
+            raise ValueError(f"Bad parity '{rule['parity']}', expected 'odd' or 'even'")
+        odd = rule["parity"] == "odd"
+        selected = [card for card in selected if (CARD_VALUES[card] % 2 == 1) == odd]
+    if "ranks" in rule:
+        unknown = [name for name in rule["ranks"] if name not in RANKS]
+        if unknown:
+            raise ValueError(f"Unknown ranks {unknown}")
+        ranks = {RANKS.index(name) for name in rule["ranks"]}
+        selected = [card for card in selected if CARD_RANKS[card] in ranks]
+    return list(selected)
+
+
+class CardRules:
+    """Compiled rules: cost and effects of every card"""
+
+    def __init__(self, costs, effects):
+        self.costs = costs  # card -> mana cost
+        self.effects = effects  # card -> ((effect name, amount), ...)
+        self.plays = [compile_card(cost, card_effects) for cost, card_effects in zip(costs, effects)]
+
+        slots = max(1, max(len(card_effects) for card_effects in effects))
+        self.ops = np.zeros((DECK_SIZE, slots), dtype=np.int8)
+        self.amounts = np.zeros((DECK_SIZE, slots), dtype=np.int32)
+        for card, card_effects in enumerate(effects):
+            for slot, (name, amount) in enumerate(card_effects):
+                self.ops[card, slot] = OPCODES[name]
+                self.amounts[card, slot] = amount
+
+    def describe(self, card):
+        """'Ace of Spades: cost 14, damage 14'"""
+        effects = ", ".join(f"{name} {amount}" for name, amount in self.effects[card])
+        return f"{CARD_NAMES[card]}: cost {self.costs[card]}, {effects or 'no effect'}"
+
+
+def compile_rules(spec):
+    """Resolve a rules spec ({"rules": [...]}) into a CardRules table"""
+    costs = [None] * DECK_SIZE
+    effects = [None] * DECK_SIZE
+    for n, rule in enumerate(spec["rules"]):
+        try:
+            for card in selected_cards(rule):
+                value = CARD_VALUES[card]
+                costs[card] = parse_amount(rule.get("cost", "value"), value)
+                card_effects = []
+                for effect in rule.get("effects", []):
+                    name, *amount = effect
+                    if name not in OPCODES:
+                        raise ValueError(f"Unknown effect '{name}', expected one of {sorted(OPCODES)}")
+                    card_effects.append((name, parse_amount(amount[0], value) if amount else 0))
+                effects[card] = tuple(card_effects)
+        except (ValueError, TypeError) as error:
+            raise ValueError(f"Card rule {n} {rule}: {error}") from None
+
+    missing = [CARD_NAMES[card] for card in range(DECK_SIZE) if costs[card] is None]
+    if missing:
+        raise ValueError(f"No rule covers {', '.join(missing)}")
+    return CardRules(costs, effects)
+
+
+def load_rules(path=RULES_PATH):
+    with open(path, 'r', encoding='utf-8') as file:
+        return compile_rules(json.load(file))
+
+
+if __name__ == "__main__":
+    table = load_rules()
+    for card in range(DECK_SIZE):
+        print(table.describe(card))
@@ -0,0 +1,54 @@
+"""Retained-mode bookkeeping for dirty-rectangle rendering.
+
+Each frame the caller describes what is on screen as ``{name: (rect,
+state)}`` where ``state`` is a small hashable value (card tuple, counter,
+hover flag...).  ``Scene.update`` compares that with the previous frame and
+returns the rects that changed; ``Scene.draw`` then redraws only inside
+those rects and pushes them with ``pygame.display.update``.  When nothing
+changed no drawing or presenting happens at all.
+"""
+import pygame
+
+
+class Scene:
+    def __init__(self, screen, profiler=None):
+        self.screen = screen
+        self.profiler = profiler
+        self._elements = {}
+        self._full_redraw = True
+
+    def invalidate(self):
+        """Redraw and present the whole screen next frame"""
+        self._full_redraw = True
+
+    def update(self, elements):
+        """Return the dirty rects between last frame's elements and ``elements``"""
+        if self._full_redraw:
+            self._full_redraw = False
+            dirty = [self.screen.get_rect()]
+        else:
+            dirty = []
+            for name, (rect, state) in elements.items():
+                old = self._elements.get(name)
+                if old is None:
+                    dirty.append(rect)
+                elif old[1] != state or old[0] != rect:
+                    dirty.append(rect.union(old[0]))
+            for name in self._elements.keys() - elements.keys():
+                dirty.append(self._elements[name][0])
+        self._elements = elements
+        return [rect.clip(self.screen.get_rect()) for rect in dirty]
+
+    def draw(self, dirty, draw_frame):
+        """Run ``draw_frame`` clipped to the dirty area and present only ``dirty``"""
+        if not dirty:
+            return False
+        self.screen.set_clip(dirty[0].unionall(dirty[1:]))
+        draw_frame()
+        self.screen.set_clip(None)
+        if self.profiler is not None:
+            self.profiler.mark("draw")
+        pygame.display.update(dirty)
+        if self.profiler is not None:
+            self.profiler.mark("present")
+        return True
@@ -0,0 +1,306 @@
+"""Search-based AI for choosing which card to play.
+
+``SearchAI.choose(state, rng)`` runs expectimax over the engine rules,
+from the side to move through the end of its opponent's next turn: the
+side's own plays are max nodes, the opponent's plays and draws are min
+nodes, and every draw is a chance node over the remaining deck (the AI
+looks at what is left in a deck, never at its order).  The search deepens
+one ply at a time until ``budget_ms`` runs out and answers with the deepest
+finished iteration (or, if even the first ply runs out, the best card scored
+so far).  Positions are cached in a transposition table keyed by a compact
+state tuple: both sides' life, poison, shield, damage and mana, their hands,
+and their deck remainders as sorted bytes.  The table is cleared at the start
+of every move and holds at most MAX_TABLE_SIZE positions.
+
+Difficulty levels (``DIFFICULTIES``, CARD_GAME_AI in game.py) map to search
+budgets:
+
+    easy     a random card, the original behaviour
+    normal   10 ms, 3 plies
+    hard     50 ms
+    expert   250 ms, still well inside ENEMY_DISPLAY_TIME (750 ms)
+
+A search that runs out of time depends on the machine's speed.  For seeded
+matches, ``for_difficulty(name, fixed_nodes=True)`` swaps the clock for a
+budget of NODES_PER_MS nodes per millisecond, so the same seed, decks and
+actions replay the same enemy moves on any machine.
+"""
+import time
+
+import engine
+
+# name -> (budget in ms, max plies); None plays a random card
+DIFFICULTIES = {
+    "easy": None,
+    "normal": (10, 3),
+    "hard": (50, 40),
+    "expert": (250, 40),
+}
+DEFAULT_DIFFICULTY = "hard"
+
+WIN_SCORE = 10000
+POISON_WEIGHT = 1.5  # poison hits again at the next resolution
+SHIELD_WEIGHT = 0.5
+MANA_WEIGHT = 0.7  # mana left to the side to move, roughly a card's worth of effect per point
+
+CHANCE_SAMPLES = 6  # draws tried per chance node when the deck has more distinct cards
+CHECK_EVERY = 32  # nodes between clock checks
+MAX_TABLE_SIZE = 50000
+NODES_PER_MS = 100  # node budget per ms of time budget for fixed_nodes searches, a bit under a typical machine's rate
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class _Stats:
+    """The combat numbers of one side; engine.calc_damage and resolve_turn work on it directly"""
+    __slots__ = ("life", "poison", "shield", "damage_value", "mana")
+
+    def __init__(self, side):
+        self.life = side.life
+        self.poison = side.poison
+        self.shield = side.shield
+        self.damage_value = side.damage_value
+        self.mana = side.mana
+
+    def copy(self):
+        return _Stats(self)
+
+    def key(self):
+        return self.life, self.poison, self.shield, self.damage_value, self.mana
+
+
+class Position:
+    """One search node; index 0 is the searching side, 1 its opponent"""
+    __slots__ = ("stats", "hands", "decks", "turn")
+
+    def __init__(self, stats, hands, decks, turn):
+        self.stats = stats  # (_Stats, _Stats)
+        self.hands = hands  # (bytes, bytes) in hand order, oldest first
+        self.decks = decks  # (bytes, bytes) sorted, the multiset left to draw
+        self.turn = turn  # 0 while the searching side plays, 1 during the reply
+
+    @classmethod
+    def from_match(cls, state):
+        sides = (state.active, state.opponent)
+        return cls(tuple(_Stats(side) for side in sides),
+                   tuple(bytes(side.drawn_cards) for side in sides),
+                   tuple(bytes(sorted(side.deck.peek(len(side.deck)))) for side in sides),
+                   0)
+
+    def key(self, depth):
+        mine, theirs = self.stats
+        return (mine.key(), theirs.key(), self.hands, self.decks, self.turn, depth)
+
+    @property
+    def finished(self):
+        return self.stats[0].life <= 0 or self.stats[1].life <= 0
+
+
+# -------------------------------
+# Moves
+# -------------------------------
+def play(pos, index):
+    """Position after the side to move plays ``pos.hands[turn][index]``"""
+    t = pos.turn
+    stats = [pos.stats[0].copy(), pos.stats[1].copy()]
+    hand = pos.hands[t]
+    engine.calc_damage(stats[t], hand[index], stats[1 - t])
+    hands = list(pos.hands)
+    hands[t] = hand[:index] + hand[index + 1:]
+    return Position(tuple(stats), tuple(hands), pos.decks, t)
+
+
+def draw(pos, card, cost=1):
+    """Position after the side to move draws ``card`` (None from an empty deck)"""
+    t = pos.turn
+    stats = pos.stats
+    if cost:
+        stats = [stats[0].copy(), stats[1].copy()]
+        stats[t].mana -= cost
+        stats = tuple(stats)
+    hands = list(pos.hands)
+    decks = list(pos.decks)
+    if card is not None:
+        hand = hands[t]
+        if len(hand) == engine.HAND_SIZE:
+            hand = hand[1:]  # a full hand drops its oldest card
+        hands[t] = hand + bytes((card,))
+        decks[t] = decks[t].replace(bytes((card,)), b"", 1)
+    return Position(stats, tuple(hands), tuple(decks), t)
+
+
+def end_turn(pos):
+    """Resolve the turn of the side to move and hand over, before any turn-start draw"""
+    t = pos.turn
+    stats = [pos.stats[0].copy(), pos.stats[1].copy()]
+    engine.resolve_turn(stats[t], stats[1 - t])
+    return Position(tuple(stats), pos.hands, pos.decks, 1 - t)
+
+
+def draw_outcomes(deck):
+    """(card, probability) for one uniform draw from a sorted deck remainder"""
+    total = len(deck)
+    return [(card, deck.count(card) / total) for card in sorted(set(deck))]
+
+
+# -------------------------------
+# Evaluation
+# -------------------------------
+def evaluate(pos):
+    """Static score from the searching side's point of view"""
+    mine, theirs = pos.stats
+    if pos.finished:
+        if mine.life == theirs.life:
+            return 0
+        return WIN_SCORE + mine.life - theirs.life if mine.life > theirs.life else -WIN_SCORE + mine.life - theirs.life
+    score = mine.life - theirs.life
+    score += POISON_WEIGHT * (theirs.poison - mine.poison)
+    score += SHIELD_WEIGHT * (mine.shield - theirs.shield)
+    if pos.turn == 0:
+        score += max(0, mine.damage_value - theirs.shield) + MANA_WEIGHT * max(0, mine.mana)
+    else:
+        score -= max(0, theirs.damage_value - mine.shield) + MANA_WEIGHT * max(0, theirs.mana)
+    return score
+
+
+# -------------------------------
+# Search
+# -------------------------------
+class SearchAI:
+    def __init__(self, budget_ms=50, max_depth=40, samples=CHANCE_SAMPLES,
+                 opponent_turn_draw=engine.PLAYER_TURN_DRAW, node_budget=None):
+        self.budget = budget_ms / 1000
+        self.node_budget = node_budget  # stop after this many nodes instead of at the clock
+        self.max_depth = max_depth
+        self.samples = samples
+        # Cards the opponent draws when its turn begins; only a single card is searched
+        # as a chance node, larger draws end the horizon
+        self.opponent_turn_draw = opponent_turn_draw
+        self.table = {}  # Position.key(depth) -> value
+        self.nodes = 0
+        self.depth_reached = 0
+        self._deadline = None
+        self._rng = None
+        self._stopped = False
+        self._cut = False  # an iteration stopped at its depth limit somewhere
+
+    @classmethod
+    def for_difficulty(cls, name, fixed_nodes=False, **kwargs):
+        """A SearchAI for a DIFFICULTIES name, None for the random level
+
+        ``fixed_nodes`` bounds the search by nodes rather than time, so its moves are reproducible.
+        """
+        levels = DIFFICULTIES[name]
+        if levels is None:
+            return None
+        budget_ms, max_depth = levels
+        if fixed_nodes:
+            kwargs["node_budget"] = budget_ms * NODES_PER_MS
+        return cls(budget_ms, max_depth, **kwargs)
+
+    def choose(self, state, rng):
+        """Hand index the active side of ``state`` should play (its hand must not be empty)"""
+        return self.search(Position.from_match(state), rng)
+
+    def search(self, pos, rng):
+        """Hand index to play from ``pos``; safe to run on a worker thread with a snapshot Position"""
+        hand = pos.hands[0]
+        if len(set(hand)) == 1:
+            return 0
+
+        # Sampled chance nodes make old values stale, and a small table clears fast
+        self.table.clear()
+        self.nodes = 0
+        self.depth_reached = 0
+        self._stopped = False
+        self._deadline = time.perf_counter() + self.budget
+        self._rng = rng
+        candidates = [hand.index(card) for card in sorted(set(hand))]
+        best = candidates
+        for depth in range(1, self.max_depth + 1):
+            self._cut = False
+            values = []
+            try:
+                for i in candidates:
+                    values.append(self._value(play(pos, i), depth - 1))
+            except _OutOfTime:
+                if depth == 1 and values:
+                    # No deeper answer to fall back on: the best of the cards scored so far
+                    top = max(values)
+                    best = [i for i, value in zip(candidates, values) if value >= top - 1e-9]
+                break
+            top = max(values)
+            best = [i for i, value in zip(candidates, values) if value >= top - 1e-9]
+            self.depth_reached = depth
+            if not self._cut:
+                break  # the whole horizon fit, deeper iterations would repeat it
+        return rng.choice(best)
+
+    def policy(self, state, rng):
+        """engine.play_match policy: play the searched card, draw when the hand is empty"""
+        if state.active.drawn_cards:
+            return "play", self.choose(state, rng)
+        return "draw", None
+
+    def stop(self):
+        """End a running search early (from another thread); it answers with what it has"""
+        self._stopped = True
+
+    def _tick(self):
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and (self._stopped or self._over_budget()):
+            raise _OutOfTime
+
+    def _over_budget(self):
+        if self.node_budget is not None:
+            return self.nodes >= self.node_budget
+        return time.perf_counter() > self._deadline
+
+    def _value(self, pos, depth):
+        """Expectimax value of ``pos`` searched ``depth`` plies deep"""
+        self._tick()
+        t = pos.turn
+        if pos.stats[t].mana < 0:
+            return self._turn_over(pos, depth)
+        if pos.finished:
+            return evaluate(pos)
+        if depth <= 0:
+            self._cut = True
+            return evaluate(pos)
+
+        key = pos.key(depth)
+        value = self.table.get(key)
+        if value is not None:
+            return value
+
+        hand = pos.hands[t]
+        values = [self._value(play(pos, hand.index(card)), depth - 1) for card in set(hand)]
+        if t == 1 or not hand:
+            # The searching side only draws from an empty hand, like the enemy in game.py
+            values.append(self._draw_value(pos, depth - 1))
+        value = max(values) if t == 0 else min(values)
+        if len(self.table) < MAX_TABLE_SIZE:
+            self.table[key] = value
+        return value
+
+    def _draw_value(self, pos, depth, cost=1):
+        deck = pos.decks[pos.turn]
+        if not deck or depth <= 0:
+            # evaluate() doesn't look at hands, so every card scores the same at the horizon
+            return self._value(draw(pos, None, cost), depth)
+        outcomes = draw_outcomes(deck)
+        if len(outcomes) > self.samples:
+            # Monte Carlo over the hidden draw: an equally weighted sample of the deck
+            cards = self._rng.sample(deck, self.samples)
+            return sum(self._value(draw(pos, card, cost), depth) for card in cards) / len(cards)
+        return sum(p * self._value(draw(pos, card, cost), depth) for card, p in outcomes)
+
+    def _turn_over(self, pos, depth):
+        if pos.turn == 1:
+            return evaluate(end_turn(pos))  # end of the horizon
+        pos = end_turn(pos)
+        if pos.finished or self.opponent_turn_draw != 1:
+            return evaluate(pos)
+        return self._draw_value(pos, depth, cost=0)
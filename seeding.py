@@ -0,0 +1,61 @@
+"""Seeded random streams.
+
+Everything that needs randomness gets its own stream, derived from one seed
+and a key with numpy's SeedSequence: each side's deck shuffles, each AI,
+every worker or shard of a simulation run and the deck optimizer.  Streams
+with different keys are independent and don't overlap, so a match replays
+exactly from (seed, decks, player actions) and parallel workers never share
+or correlate draws.
+Deriving a stream is a few microseconds of hashing, done once per consumer.
+"""
+import random
+
+import numpy as np
+
+# First spawn_key element of each kind of stream
+PLAYER_DECK, ENEMY_DECK, PLAYER_AI, ENEMY_AI = range(4)
+WORKER = 100
+SHARD = 101
+OPTIMIZER = 102
+
+
+def new_seed():
+    """A fresh 128-bit seed from OS entropy, for matches that weren't given one"""
+    return np.random.SeedSequence().entropy
+
+
+def seed_sequence(seed, *key):
+    """The SeedSequence of stream ``key`` under ``seed`` (picklable, for workers)"""
+    return np.random.SeedSequence(seed, spawn_key=key)
+
+
+def python_stream(seed, *key):
+    """A random.Random for stream ``key`` under ``seed``"""
+    state = seed_sequence(seed, *key).generate_state(4)
+    return random.Random(int.from_bytes(state.tobytes(), "little"))
+
+
+def numpy_stream(seed, *key):
+    """A numpy Generator for stream ``key`` under ``seed``"""
+    return np.random.default_rng(seed_sequence(seed, *key))
+
+
+def worker_sequences(seed, n):
+    """One SeedSequence per parallel worker"""
+    return [seed_sequence(seed, WORKER, i) for i in range(n)]
+
+
+class MatchStreams:
+    """The random streams of one match.
+
+    ``key`` nests the match under a larger run, e.g. ``(WORKER, w, i)`` for
+    the i-th match played by worker w.
+    """
+
+    def __init__(self, seed=None, *key):
+        self.seed = new_seed() if seed is None else seed
+        self.key = key
+        self.player_deck = python_stream(self.seed, *key, PLAYER_DECK)
+        self.enemy_deck = python_stream(self.seed, *key, ENEMY_DECK)
+        self.player_ai = python_stream(self.seed, *key, PLAYER_AI)
+        self.enemy_ai = python_stream(self.seed, *key, ENEMY_AI)
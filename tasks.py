@@ -0,0 +1,77 @@
+"""Background tasks for the game loops.
+
+``TaskRunner.submit(name, fn, *args)`` runs ``fn`` on a worker thread and
+posts a ``TASK_DONE`` pygame event (attributes ``name``, ``id``, ``result``,
+``error``) when it finishes, so the loop that handed the work off keeps
+drawing frames meanwhile.  The loop passes each ``TASK_DONE`` event to
+``collect``, which says whether the result is still wanted: a task
+resubmitted under the same name or cancelled with ``cancel`` is forgotten
+and its late event ignored.  ``on_cancel`` lets a running task be told to
+stop early (e.g. ``SearchAI.stop``).
+
+The workers are threads: the tasks are short (a timed search, reading a
+deck file) and share state with the game without pickling; the GIL's
+switch interval keeps the render loop running while one thinks.
+"""
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+TASK_DONE = pygame.event.custom_type()
+
+
+class TaskRunner:
+    def __init__(self, workers=2):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="game-task")
+        self._ids = itertools.count(1)
+        self._tasks = {}  # name -> (id, future, on_cancel) of the task whose result is wanted
+
+    def submit(self, name, fn, *args, on_cancel=None):
+        """Run ``fn(*args)`` in the background, replacing any task called ``name``"""
+        self.cancel(name)
+        task_id = next(self._ids)
+        future = self.executor.submit(fn, *args)
+        self._tasks[name] = (task_id, future, on_cancel)
+        future.add_done_callback(lambda f: self._post(name, task_id, f))
+        return task_id
+
+    def _post(self, name, task_id, future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        result = None if error else future.result()
+        try:
+            pygame.event.post(pygame.event.Event(TASK_DONE, name=name, id=task_id, result=result, error=error))
+        except pygame.error:
+            pass  # the display is gone, nobody is waiting any more
+
+    def busy(self, name):
+        """True until the result of task ``name`` has been collected"""
+        return name in self._tasks
+
+    def collect(self, event):
+        """True when ``event`` carries a result that is still wanted; re-raises the task's error"""
+        task = self._tasks.get(event.name)
+        if task is None or task[0] != event.id:
+            return False
+        del self._tasks[event.name]
+        if event.error is not None:
+            raise event.error
+        return True
+
+    def cancel(self, name):
+        task = self._tasks.pop(name, None)
+        if task is None:
+            return
+        _, future, on_cancel = task
+        if not future.cancel() and on_cancel is not None:
+            on_cancel()  # already running
+
+    def cancel_all(self):
+        for name in list(self._tasks):
+            self.cancel(name)
+
+    def shutdown(self):
+        self.cancel_all()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,36 @@
+import random
+
+import batch_sim
+import engine
+from cards import new_deck
+
+
+def engine_summary(player_cards, enemy_cards, n, seed):
+    wins = {"player": 0, "enemy": 0, None: 0}
+    turns = 0
+    for i in range(n):
+        state = engine.play_match(player_cards, enemy_cards, seed=seed + i)
+        wins[state.winner] += 1
+        turns += state.turns
+    return wins["player"] / n, wins["enemy"] / n, turns / n
+
+
+def check_agrees(player_cards, enemy_cards, seed):
+    player, enemy, turns = engine_summary(player_cards, enemy_cards, 1000, seed)
+    result = batch_sim.simulate(player_cards, enemy_cards, 20000, seed)
+    # About four standard errors of the 1000 engine matches
+    assert abs(result["player_wins"] / result["games"] - player) < 0.03
+    assert abs(result["enemy_wins"] / result["games"] - enemy) < 0.03
+    assert abs(result["turns"] / result["games"] - turns) < 0.05 * turns
+
+
+def test_fresh_decks_match_engine():
+    check_agrees(new_deck(), new_deck(), seed=1)
+
+
+def test_random_decks_match_engine():
+    rng = random.Random(2)
+    # Uneven decks with repeats, so every effect shows up in a different mix
+    player_cards = [rng.randrange(52) for _ in range(40)]
+    enemy_cards = [rng.randrange(52) for _ in range(30)]
+    check_agrees(player_cards, enemy_cards, seed=3)
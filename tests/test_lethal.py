@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+import engine
+import lethal
+from search_ai import Position, _Stats, draw, end_turn, play
+
+
+class Side:
+    def __init__(self, life, poison, shield, damage_value=0, mana=0):
+        self.life = life
+        self.poison = poison
+        self.shield = shield
+        self.damage_value = damage_value
+        self.mana = mana
+
+
+@pytest.fixture(scope="module")
+def table():
+    return lethal.LethalTable(lethal.quantize(lethal.solve(engine.CARD_RULES)))
+
+
+def certain_kill(pos):
+    """Whether every draw sequence lets the side to move kill this turn, by exhaustive search"""
+    mine = pos.stats[0]
+    if mine.mana < 0:
+        return end_turn(pos).stats[1].life <= 0
+    hand = pos.hands[0]
+    if hand:
+        return any(certain_kill(play(pos, i)) for i in range(len(hand)))
+    deck = pos.decks[0]
+    if not deck:
+        return certain_kill(draw(pos, None))
+    return all(certain_kill(draw(pos, card)) for card in set(deck))
+
+
+def random_position(rng):
+    mine = _Stats(Side(rng.randint(1, 30), rng.randint(0, 3), rng.randint(0, 10),
+                       rng.choice([0, 0, rng.randint(0, 14)]), rng.randint(0, 6)))
+    theirs = _Stats(Side(rng.randint(1, 20), rng.randint(0, 6), rng.randint(0, 8)))
+    hand = bytes(rng.sample(range(52), rng.randint(0, 2)))
+    deck = bytes(sorted(rng.sample(range(52), rng.choice([0, 8, 12]))))
+    return Position((mine, theirs), (hand, b""), (deck, b""), 0)
+
+
+def test_certain_kills_match_brute_force(table):
+    rng = random.Random(0)
+    claims = kills = 0
+    for _ in range(1500):
+        pos = random_position(rng)
+        claimed = table.kill_chance(pos) == 255
+        kill = certain_kill(pos)
+        assert kill or not claimed, (pos.stats[0].key(), pos.stats[1].key(), list(pos.hands[0]), len(pos.decks[0]))
+        claims += claimed
+        kills += kill
+    assert kills > 100
+    assert claims >= 0.9 * kills
+
+
+def test_lethal_play_kills(table):
+    rng = random.Random(1)
+    found = 0
+    for _ in range(1500):
+        pos = random_position(rng)
+        index = table.lethal_play(pos)
+        if index is None:
+            continue
+        found += 1
+        assert certain_kill(play(pos, index))
+    assert found > 0
@@ -0,0 +1,39 @@
+import engine
+import replay
+from cards import new_deck
+from seeding import MatchStreams
+
+
+def side_state(side):
+    return (side.deck.tolist(), list(side.drawn_cards), side.life, side.poison, side.shield,
+            side.damage_value, side.mana)
+
+
+def test_engine_match_round_trip(tmp_path):
+    streams = MatchStreams(7)
+    state = engine.new_match(new_deck(), new_deck(), streams)
+    path = tmp_path / "match.cgr"
+    recorder = replay.MatchRecorder(path, streams.seed, state.player, state.enemy)
+    while not state.finished and state.turns < 500:
+        rng = streams.player_ai if state.player_turn else streams.enemy_ai
+        action, index = engine.random_policy(state, rng)
+        if action == "play":
+            recorder.record(replay.PLAY, index)
+            engine.apply_play(state, index)
+        else:
+            recorder.record(replay.DRAW)
+            engine.apply_draw(state)
+        if state.turn_over:
+            recorder.record(replay.END_TURN)
+            engine.end_turn(state)
+    recorder.close()
+
+    replayed = replay.Replay.from_file(path)
+    final = replayed.run()
+    assert replayed.seed == streams.seed
+    assert (final.player_turn, final.turns, final.winner) == (state.player_turn, state.turns, state.winner)
+    assert side_state(final.player) == side_state(state.player)
+    assert side_state(final.enemy) == side_state(state.enemy)
+
+    # Seeking through snapshots agrees with the full pass
+    assert side_state(replayed.state_at(len(replayed)).enemy) == side_state(state.enemy)
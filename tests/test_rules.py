@@ -0,0 +1,83 @@
+import random
+
+import numpy as np
+
+import batch_sim
+import engine
+from cards import CARD_SUITS, CARD_VALUES, new_deck
+
+HEARTS, DIAMONDS, CLUBS, SPADES = range(4)
+
+
+class Stats:
+    def __init__(self, rng):
+        self.life = rng.randint(-5, 40)
+        self.poison = rng.randint(0, 12)
+        self.shield = rng.randint(0, 30)
+        self.damage_value = rng.randint(0, 14)
+        self.mana = rng.randint(-3, 20)
+
+    def copy(self):
+        other = Stats.__new__(Stats)
+        other.__dict__.update(self.__dict__)
+        return other
+
+    def key(self):
+        return self.life, self.poison, self.shield, self.damage_value, self.mana
+
+
+def reference_play(side, card, enemy):
+    """The suit chain engine.calc_damage ran before card_rules.json"""
+    value = CARD_VALUES[card]
+    suit = CARD_SUITS[card]
+    side.mana -= value
+    if suit == CLUBS:
+        if value % 2:
+            enemy.poison += value
+        else:
+            side.poison = max(0, side.poison - (value - 1))
+    elif suit == SPADES:
+        side.damage_value = value
+    elif suit == DIAMONDS:
+        if value % 2:
+            side.shield += 2 * value
+        else:
+            enemy.shield = max(0, enemy.shield - value)
+            side.damage_value = side.shield
+    elif suit == HEARTS:
+        side.life += value
+
+
+def test_card_plays_match_reference():
+    rng = random.Random(0)
+    for _ in range(20000):
+        card = rng.randrange(52)
+        side, enemy = Stats(rng), Stats(rng)
+        expected = (side.copy(), enemy.copy())
+        reference_play(expected[0], card, expected[1])
+        engine.CARD_PLAYS[card](side, enemy)
+        assert (side.key(), enemy.key()) == (expected[0].key(), expected[1].key()), card
+
+
+def test_batch_opcodes_match_reference():
+    n = 5000
+    rng = random.Random(1)
+    batch = batch_sim.BatchMatches(new_deck(), new_deck(), n, np.random.default_rng(1))
+    sides = [[Stats(rng), Stats(rng)] for _ in range(n)]
+    for i, pair in enumerate(sides):
+        for s, stats in enumerate(pair):
+            batch.life[s, i], batch.poison[s, i], batch.shield[s, i], batch.damage[s, i], batch.mana[s, i] = stats.key()
+    batch.hand[:] = np.array([[rng.sample(range(52), engine.HAND_SIZE) for _ in range(n)] for _ in range(2)])
+    batch.hand_len[:] = engine.HAND_SIZE
+
+    s = np.array([rng.randrange(2) for _ in range(n)])
+    k = np.array([rng.randrange(engine.HAND_SIZE) for _ in range(n)])
+    cards = batch.hand[s, np.arange(n), k].copy()
+    batch._play(s, np.arange(n), k)
+
+    for i, pair in enumerate(sides):
+        reference_play(pair[s[i]], int(cards[i]), pair[1 - s[i]])
+        for side, stats in enumerate(pair):
+            got = (batch.life[side, i], batch.poison[side, i], batch.shield[side, i],
+                   batch.damage[side, i], batch.mana[side, i])
+            assert tuple(int(x) for x in got) == stats.key(), (i, int(cards[i]))
@@ -0,0 +1,157 @@
+"""Round-robin Monte Carlo tournament between deck files.
+
+Usage:
+    python tournament.py decks/ --games 100000 --out results.jsonl
+
+Every deck in the directory (``*.txt`` in the ``Deck.load_deck`` format)
+plays every other deck from both seats.  Each pairing is split into shards
+of ``--shard-size`` matches that run on a process pool; every finished
+shard is appended to the results file straight away, so re-running the
+same command after an interruption only plays the shards that are missing.
+Shard ids carry a hash of the run's settings, the deck names and both
+decks' cards, so a rerun with other settings or another deck set plays
+fresh shards instead of reusing old ones, and the report only covers the
+current run's shards.  Every shard plays the stream
+``(SHARD, player index, enemy index, shard number)`` under ``--seed``.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import batch_sim
+import cards
+import seeding
+
+
+def load_decks(deck_dir):
+    decks = {}
+    for filename in sorted(os.listdir(deck_dir)):
+        if filename.endswith(".txt"):
+            decks[filename[:-len(".txt")]] = cards.read_deck_file(os.path.join(deck_dir, filename))
+    return decks
+
+
+def run_key(names, player_cards, enemy_cards, games, shard_size, seed, max_turns):
+    """Hash of everything a pairing's results depend on, the deck order included"""
+    settings = json.dumps([list(names), list(player_cards), list(enemy_cards), games, shard_size, seed, max_turns])
+    return hashlib.sha1(settings.encode()).hexdigest()[:16]
+
+
+def make_jobs(decks, games, shard_size, seed, max_turns):
+    jobs = []
+    names = list(decks)
+    for i, player in enumerate(names):
+        for j, enemy in enumerate(names):
+            if player == enemy:
+                continue
+            key = run_key(names, decks[player], decks[enemy], games, shard_size, seed, max_turns)
+            for shard, start in enumerate(range(0, games, shard_size)):
+                jobs.append({
+                    "id": f"{player}|{enemy}|{shard}|{key}",
+                    "player": player,
+                    "enemy": enemy,
+                    "games": min(shard_size, games - start),
+                    "seed": seed,
+                    # Distinct spawn key per shard: streams never collide, and the key is
+                    # stable across resumed runs since the id pins the deck order
+                    "stream": [i, j, shard],
+                })
+    return jobs
+
+
+def run_shard(job, player_cards, enemy_cards, max_turns):
+    stream = seeding.seed_sequence(job["seed"], seeding.SHARD, *job["stream"])
+    result = batch_sim.simulate(player_cards, enemy_cards, job["games"], stream, max_turns)
+    result.update(id=job["id"], player=job["player"], enemy=job["enemy"])
+    return result
+
+
+def read_checkpoint(path):
+    """Results already on disk, keyed by job id.
+
+    A torn last line (an interrupted write) is cut off the file, so the next
+    record is appended on a line of its own.
+    """
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, 'rb+') as file:
+        data = file.read()
+        complete = data[:data.rfind(b"\n") + 1]
+        if len(complete) < len(data):
+            file.truncate(len(complete))
+    for line in complete.decode('utf-8').splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        done[record["id"]] = record
+    return done
+
+
+def wilson_interval(wins, games, z=1.96):
+    if games == 0:
+        return 0.0, 1.0
+    p = wins / games
+    denom = 1 + z * z / games
+    centre = (p + z * z / (2 * games)) / denom
+    margin = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / denom
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def report(records, file=sys.stdout):
+    pairs = {}
+    for record in records:
+        total = pairs.setdefault((record["player"], record["enemy"]),
+                                 {"games": 0, "player_wins": 0, "enemy_wins": 0, "unfinished": 0, "turns": 0})
+        for key in total:
+            total[key] += record[key]
+
+    print(f"{'player':<20} {'enemy':<20} {'games':>9} {'win %':>7} {'95% CI':>17} {'unfin.':>7} {'turns':>7}", file=file)
+    for (player, enemy), total in sorted(pairs.items()):
+        games = total["games"]
+        low, high = wilson_interval(total["player_wins"], games)
+        print(f"{player:<20} {enemy:<20} {games:>9} {100 * total['player_wins'] / games:>6.2f}% "
+              f"[{100 * low:6.2f}, {100 * high:6.2f}] {total['unfinished']:>7} {total['turns'] / games:>7.1f}",
+              file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("deck_dir", help="directory of deck files (*.txt)")
+    parser.add_argument("--games", type=int, default=100_000, help="matches per seated pairing")
+    parser.add_argument("--shard-size", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="tournament_results.jsonl", help="results / checkpoint file")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    decks = load_decks(args.deck_dir)
+    if len(decks) < 2:
+        parser.error(f"need at least two deck files in {args.deck_dir}")
+
+    done = read_checkpoint(args.out)
+    plan = make_jobs(decks, args.games, args.shard_size, args.seed, args.max_turns)
+    jobs = [job for job in plan if job["id"] not in done]
+    print(f"{len(decks)} decks, {len(plan) - len(jobs)} shards done, {len(jobs)} to play")
+
+    with open(args.out, 'a', encoding='utf-8') as out, ProcessPoolExecutor(args.workers) as pool:
+        futures = [pool.submit(run_shard, job, decks[job["player"]], decks[job["enemy"]], args.max_turns)
+                   for job in jobs]
+        for n, future in enumerate(as_completed(futures), 1):
+            record = future.result()
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            done[record["id"]] = record
+            print(f"[{n}/{len(jobs)}] {record['id']}", flush=True)
+
+    report(done[job["id"]] for job in plan)
+
+
+if __name__ == "__main__":
+    main()